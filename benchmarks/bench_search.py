@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""
+Compares storage.search() with a scan of the reviews of storage.all()
+
+Usage: python3 -m benchmarks.bench_search [number of reviews ...]
+
+Each size runs in its own process on the memory storage engine, so that
+neither the snapshot nor the disk is timed.
+"""
+
+import os
+import random
+import subprocess
+import sys
+from time import perf_counter
+
+SIZES = [1000000]
+QUERIES = 100
+SCANS = 3
+
+
+def populate(count):
+    """adds count reviews of 20 words drawn from 10000 made-up words"""
+    import models
+    from models.review import Review
+    rand = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = ["".join(rand.choice(letters) for i in range(rand.randint(3, 9)))
+             for i in range(10000)]
+    for i in range(count):
+        text = " ".join(rand.choice(words) for j in range(20))
+        models.storage.new(Review(place_id="", user_id="", text=text))
+    return words
+
+
+def search(count):
+    """times the index build, word and prefix searches, and scans"""
+    import models
+    from models.engine.search_index import tokenize
+    from models.review import Review
+    words = populate(count)
+    rand = random.Random(1)
+    queries = [" ".join(rand.sample(words, 2)) for i in range(QUERIES)]
+    start = perf_counter()
+    models.storage.search(queries[0], Review)
+    timings = [perf_counter() - start]
+    start = perf_counter()
+    for text in queries:
+        models.storage.search(text, Review)
+    timings.append((perf_counter() - start) / QUERIES)
+    start = perf_counter()
+    for text in queries:
+        models.storage.search(text[:3], Review, prefix=True)
+    timings.append((perf_counter() - start) / QUERIES)
+    start = perf_counter()
+    for text in queries[:SCANS]:
+        wanted = set(tokenize(text))
+        [review for review in models.storage.all(Review).values()
+         if wanted <= set(tokenize(review.text))]
+    timings.append((perf_counter() - start) / SCANS)
+    return timings
+
+
+def run(count):
+    """runs the benchmark of count reviews in a child process"""
+    env = dict(os.environ, HBNB_TYPE_STORAGE="memory")
+    env.pop("HBNB_MEMORY_SEED", None)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = root
+    out = subprocess.check_output(
+        [sys.executable, "-m", "benchmarks.bench_search", "--run",
+         str(count)], env=env)
+    print("{:8d} reviews  index {:8.3f}s  2 words {:9.6f}s  prefix "
+          "{:9.6f}s  scan {:8.3f}s".format(count,
+                                           *(float(t) for t in out.split())))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--run":
+        print(*search(int(sys.argv[2])))
+    else:
+        for count in [int(arg) for arg in sys.argv[1:]] or SIZES:
+            run(count)
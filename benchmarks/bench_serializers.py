@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""
+Compares the load and save times of the FileStorage snapshot formats
+
+Usage: python3 -m benchmarks.bench_serializers [number of objects]
+"""
+
+from models.amenity import Amenity
+from models.city import City
+from models.engine.file_storage import classes
+from models.engine.serializers import serializers
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+
+def make_objects(count):
+    """returns count objects spread over the model classes"""
+    objs = []
+    for i in range(count):
+        kind = i % 6
+        if kind == 0:
+            objs.append(State(name="State {}".format(i)))
+        elif kind == 1:
+            objs.append(City(state_id=objs[-1].id, name="City {}".format(i)))
+        elif kind == 2:
+            objs.append(User(email="u{}@hbnb.io".format(i), password="pwd"))
+        elif kind == 3:
+            objs.append(Place(city_id=objs[-2].id, user_id=objs[-1].id,
+                              name="Place {}".format(i), max_guest=4,
+                              price_by_night=100, latitude=37.7,
+                              longitude=-122.4))
+        elif kind == 4:
+            objs.append(Review(place_id=objs[-1].id, user_id=objs[-2].id,
+                               text="Great stay number {}".format(i)))
+        else:
+            objs.append(Amenity(name="Amenity {}".format(i)))
+    objs.sort(key=lambda obj: obj.__class__.__name__)
+    return objs
+
+
+def bench(name, objs, directory):
+    """times saving objs and loading them back into instances"""
+    serializer = serializers[name]
+    file_path = os.path.join(directory, "bench." + name)
+    start = perf_counter()
+    with open(file_path, "w" + serializer.mode) as f:
+        serializer.dump(f, ((obj.__class__.__name__ + "." + obj.id,
+                             serializer.record(obj)) for obj in objs))
+    saved = perf_counter()
+    with open(file_path, "r" + serializer.mode) as f:
+        for key, record in serializer.load(f):
+            classes[record["__class__"]](**record)
+    loaded = perf_counter()
+    print("{:8} save {:8.3f}s  load {:8.3f}s  size {:10d} bytes".format(
+          name, saved - start, loaded - saved, os.path.getsize(file_path)))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    objs = make_objects(count)
+    print("{} objects".format(count))
+    with tempfile.TemporaryDirectory() as directory:
+        for name in sorted(serializers):
+            bench(name, objs, directory)
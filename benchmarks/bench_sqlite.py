@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""
+Compares the SQLite storage engine with FileStorage
+
+Usage: python3 -m benchmarks.bench_sqlite [number of objects ...]
+
+Each engine and size runs in its own process and temporary directory,
+since the storage engine is chosen when the models package is imported.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from time import perf_counter
+
+SIZES = [10000, 100000, 1000000]
+ENGINES = ["file", "sqlite"]
+
+
+def populate(count):
+    """creates count objects: one State per 100 Cities"""
+    import models
+    from models.city import City
+    from models.state import State
+    start = perf_counter()
+    with models.storage.batch():
+        state = None
+        for i in range(count):
+            if i % 101 == 0:
+                state = State(name="State {}".format(i))
+                state.save()
+            else:
+                City(state_id=state.id, name="City {}".format(i)).save()
+    return perf_counter() - start
+
+
+def query():
+    """times the reads and the single update of a started process"""
+    start = perf_counter()
+    import models
+    from models.state import State
+    timings = [perf_counter() - start]
+    start = perf_counter()
+    states = list(models.storage.all(State).values())
+    timings.append(perf_counter() - start)
+    start = perf_counter()
+    for state in states[:100]:
+        state.cities
+    timings.append(perf_counter() - start)
+    start = perf_counter()
+    states[0].name = "Renamed"
+    states[0].save()
+    timings.append(perf_counter() - start)
+    return timings
+
+
+def run(engine, count):
+    """runs both phases for engine and count in child processes"""
+    env = dict(os.environ, HBNB_TYPE_STORAGE=engine)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = root
+    with tempfile.TemporaryDirectory() as directory:
+        results = []
+        for phase in ["populate", "query"]:
+            out = subprocess.check_output(
+                [sys.executable, "-m", "benchmarks.bench_sqlite",
+                 "--" + phase, str(count)], cwd=directory, env=env)
+            results.extend(float(t) for t in out.split())
+    print("{:7} {:8d} populate {:8.3f}s  load {:8.3f}s  all(State) "
+          "{:8.3f}s  100 x cities {:8.3f}s  update {:8.3f}s".format(
+              engine, count, *results))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--populate":
+        print(populate(int(sys.argv[2])))
+    elif len(sys.argv) == 3 and sys.argv[1] == "--query":
+        print(*query())
+    else:
+        for count in [int(arg) for arg in sys.argv[1:]] or SIZES:
+            for engine in ENGINES:
+                run(engine, count)
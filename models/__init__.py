@@ -6,9 +6,17 @@ initialize the models package
 from os import getenv
 
 
-storage_t = getenv("HBNB_TYPE_STORAGE")
+storage_engine = getenv("HBNB_TYPE_STORAGE")
+# the SQL engines share the SQLAlchemy mapping of the models
+storage_t = "db" if storage_engine in ("db", "sqlite") else storage_engine
 
-if storage_t == "db":
+if storage_engine == "sqlite":
+    from models.engine.sqlite_storage import SQLiteStorage
+    storage = SQLiteStorage()
+elif storage_engine == "memory":
+    from models.engine.memory_storage import MemoryStorage
+    storage = MemoryStorage()
+elif storage_t == "db":
     from models.engine.db_storage import DBStorage
     storage = DBStorage()
 else:
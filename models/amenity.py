@@ -12,7 +12,7 @@ class Amenity(BaseModel, Base):
     """Representation of Amenity """
     if models.storage_t == 'db':
         __tablename__ = 'amenities'
-        name = Column(String(128), nullable=False)
+        name = Column(String(128), nullable=False, index=True)
     else:
         name = ""
 
@@ -0,0 +1,145 @@
+#!/usr/bin/python3
+"""
+Contains the BitmapIndex class
+"""
+
+from threading import Lock
+
+
+class BitmapIndex:
+    """the members of each key as one bitmap per member
+
+    Each key gets a dense ordinal (freed ordinals are reused) and each
+    member an int whose bit <ordinal> is set for the keys having it, so
+    that the keys having several members are the bits of one AND. The
+    bits changed are buffered and applied to a bitmap by its next read,
+    in one pass.
+    """
+
+    def __init__(self):
+        """Instantiate an empty BitmapIndex"""
+        self.__ordinals = {}
+        self.__keys = []
+        self.__free = []
+        self.__members = {}
+        self.__bitmaps = {}
+        self.__changes = {}
+        self.__lock = Lock()
+
+    def set(self, key, members):
+        """gives key exactly the members of the iterable members"""
+        members = set(members)
+        ordinal = self.__ordinal(key)
+        old = self.__members.get(key, ())
+        changes = self.__changes
+        for member in members.symmetric_difference(old):
+            bits = changes.get(member)
+            if bits is None:
+                bits = changes[member] = {}
+            bits[ordinal] = member in members
+        self.__members[key] = members
+
+    def add(self, key, member):
+        """gives key the member member"""
+        ordinal = self.__ordinal(key)
+        self.__members.setdefault(key, set()).add(member)
+        self.__changes.setdefault(member, {})[ordinal] = True
+
+    def remove(self, key, member):
+        """takes the member member away from key"""
+        members = self.__members.get(key)
+        if members is None or member not in members:
+            return
+        members.discard(member)
+        self.__changes.setdefault(member, {})[self.__ordinals[key]] = False
+
+    def discard(self, key):
+        """removes key and its members from the index"""
+        for member in list(self.__members.pop(key, ())):
+            self.__changes.setdefault(member, {})[self.__ordinals[key]] = False
+        ordinal = self.__ordinals.pop(key, None)
+        if ordinal is not None:
+            self.__keys[ordinal] = None
+            self.__free.append(ordinal)
+
+    def drop(self, member):
+        """removes member from every key"""
+        for key in self.all_of([member]):
+            self.__members[key].discard(member)
+        self.__bitmaps.pop(member, None)
+        self.__changes.pop(member, None)
+
+    def all_of(self, members):
+        """returns the list of the keys having every member of members,
+        in ordinal order"""
+        # the binary digits of the AND, least significant first
+        digits = bin(self.__intersect(members))[:1:-1]
+        keys = []
+        ordinal = digits.find("1")
+        while ordinal >= 0:
+            keys.append(self.__keys[ordinal])
+            ordinal = digits.find("1", ordinal + 1)
+        return keys
+
+    def count(self, members):
+        """returns the number of keys having every member of members"""
+        return bin(self.__intersect(members)).count("1")
+
+    def members(self, key):
+        """returns the set of the members of key"""
+        return set(self.__members.get(key, ()))
+
+    def __len__(self):
+        """returns the number of keys indexed"""
+        return len(self.__ordinals)
+
+    def __ordinal(self, key):
+        """returns the ordinal of key, giving it one if it has none"""
+        ordinal = self.__ordinals.get(key)
+        if ordinal is None:
+            ordinal = self.__free.pop() if self.__free else len(self.__keys)
+            if ordinal == len(self.__keys):
+                self.__keys.append(key)
+            else:
+                self.__keys[ordinal] = key
+            self.__ordinals[key] = ordinal
+        return ordinal
+
+    def __bitmap(self, member):
+        """returns the bitmap of member, its buffered changes applied"""
+        if self.__changes.get(member):
+            with self.__lock:
+                changes = self.__changes.get(member)
+                if changes:
+                    self.__bitmaps[member] = self.__apply(
+                        self.__bitmaps.get(member, 0), changes)
+                    del self.__changes[member]
+        return self.__bitmaps.get(member, 0)
+
+    def __apply(self, bitmap, changes):
+        """returns bitmap with the bits of changes set or cleared"""
+        if not changes:
+            return bitmap
+        size = max(bitmap.bit_length(), max(changes) + 1)
+        data = bytearray(bitmap.to_bytes((size + 7) // 8, "little"))
+        for ordinal, present in changes.items():
+            if present:
+                data[ordinal >> 3] |= 1 << (ordinal & 7)
+            else:
+                data[ordinal >> 3] &= 0xff ^ 1 << (ordinal & 7)
+        return int.from_bytes(data, "little")
+
+    def __intersect(self, members):
+        """returns the AND of the bitmaps of members, every key if none"""
+        members = list(members)
+        if not members:
+            return self.__apply((1 << len(self.__keys)) - 1,
+                                dict.fromkeys(self.__free, False))
+        bitmaps = sorted((self.__bitmap(member) for member in members),
+                         key=int.bit_length)
+        bitmap = bitmaps[0]
+        for other in bitmaps[1:]:
+            if not bitmap:
+                break
+            bitmap &= other
+        return bitmap
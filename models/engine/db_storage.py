@@ -3,10 +3,16 @@
 Contains the class DBStorage
 """
 
+from contextlib import contextmanager
+from math import asin, cos, degrees, radians, sin
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine.geo_index import KM_PER_DEGREE, distance
+from models.engine.pool import TimedQueuePool
+from models.engine.query import OPERATORS, Query
+from models.engine.search_index import FIELDS, tokenize
 from models.place import Place
 from models.review import Review
 from models.state import State
@@ -24,40 +30,269 @@ class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    # dictionary - create_engine() pool option -> environment variable
+    # setting it and its type; SQLAlchemy's default applies when unset
+    __pool_options = {
+        "pool_size": ("HBNB_DB_POOL_SIZE", int),
+        "max_overflow": ("HBNB_DB_POOL_MAX_OVERFLOW", int),
+        "pool_timeout": ("HBNB_DB_POOL_TIMEOUT", float),
+        "pool_recycle": ("HBNB_DB_POOL_RECYCLE", int),
+        "pool_pre_ping": ("HBNB_DB_POOL_PRE_PING", lambda value: value == "1")
+    }
 
-    def __init__(self):
-        """Instantiate a DBStorage object"""
-        HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
-        HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
-        HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
-        HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
+    def __init__(self, url=None, **options):
+        """Instantiate a DBStorage object, on MySQL unless url is given,
+        its connection pool set by options or else by HBNB_DB_POOL_*"""
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        if url is None:
+            HBNB_MYSQL_USER = getenv('HBNB_MYSQL_USER')
+            HBNB_MYSQL_PWD = getenv('HBNB_MYSQL_PWD')
+            HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
+            HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
+            url = 'mysql+mysqldb://{}:{}@{}/{}'.format(HBNB_MYSQL_USER,
+                                                       HBNB_MYSQL_PWD,
+                                                       HBNB_MYSQL_HOST,
+                                                       HBNB_MYSQL_DB)
+        options.setdefault("poolclass", TimedQueuePool)
+        for option, (name, kind) in self.__pool_options.items():
+            if getenv(name) is not None:
+                options.setdefault(option, kind(getenv(name)))
+        self.__engine = create_engine(url, **options)
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    def all(self, cls=None, load=()):
+        """query on the current database session, loading the
+        relationships of the paths load (see Query.load) with selectin"""
         new_dict = {}
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+                loads = [(path, "selectin") for path in load]
+                objs = self.__session.query(classes[clss]).options(
+                    *self.__loaders(classes[clss], loads)).all()
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
         return (new_dict)
 
+    def get(self, cls, id):
+        """returns the object of class cls and id, None if not found"""
+        if type(cls) is str:
+            cls = classes.get(cls)
+        if cls is None:
+            return None
+        return self.__session.get(cls, id)
+
+    def count(self, cls=None):
+        """returns the number of rows of class cls (default: all)"""
+        total = 0
+        for clss in classes:
+            if cls is None or cls is classes[clss] or cls == clss:
+                query = self.__session.query(
+                    sqlalchemy.func.count(classes[clss].id))
+                total += query.scalar()
+        return total
+
+    def iter(self, cls=None, batch_size=1000, after_id=None):
+        """yields the rows of class cls (default: every class in turn) in
+        id order, starting after the id after_id: each batch of batch_size
+        rows is one keyset query read through a server-side cursor"""
+        for clss in sorted(classes):
+            if cls is None or cls is classes[clss] or cls == clss:
+                model = classes[clss]
+                last = after_id
+                while True:
+                    rows = self.__session.query(model).order_by(model.id)
+                    if last is not None:
+                        rows = rows.filter(model.id > last)
+                    count = 0
+                    for obj in rows.limit(batch_size).yield_per(batch_size):
+                        count += 1
+                        last = obj.id
+                        yield obj
+                    if count < batch_size:
+                        break
+
+    def search(self, text, cls=None, prefix=False):
+        """returns the objects of class cls (default: every class searched)
+        whose FIELDS contain every word of text, the last one only as a
+        prefix if prefix is True, ordered by class and id
+
+        The query narrows the rows down with one case-insensitive LIKE per
+        word, then the words of each row are checked, so that the result
+        is the committed state of the database.
+        """
+        words = tokenize(text)
+        if not words:
+            return []
+        last = words.pop() if prefix else None
+        objs = []
+        for clss in sorted(FIELDS):
+            if cls is None or cls is classes[clss] or cls == clss:
+                model = classes[clss]
+                columns = [sqlalchemy.func.lower(getattr(model, attr))
+                           for attr in FIELDS[clss]]
+                rows = self.__session.query(model)
+                for word in words + ([last] if last else []):
+                    pattern = "%{}%".format(word.replace("_", "\\_"))
+                    rows = rows.filter(sqlalchemy.or_(*[
+                        column.like(pattern, escape="\\")
+                        for column in columns]))
+                for obj in rows.order_by(model.id):
+                    found = set(tokenize(" ".join(
+                        str(getattr(obj, attr)) for attr in FIELDS[clss]
+                        if getattr(obj, attr, None))))
+                    if found.issuperset(words) and (last is None or any(
+                            word.startswith(last) for word in found)):
+                        objs.append(obj)
+        return objs
+
+    def within(self, south, west, north, east):
+        """returns the places inside the bounding box, which crosses the
+        antimeridian when west is greater than east, ordered by id; one
+        query on the indexed latitude and longitude columns"""
+        return list(self.__session.query(Place).filter(
+            self.__box(south, west, north, east)).order_by(Place.id))
+
+    def nearest(self, lat, lon, k=None, radius=None):
+        """returns the k places (default: all) nearest to lat, lon and
+        within radius km (default: any distance), nearest first
+
+        The candidates are the places of a bounding box around the point,
+        ranked by distance in Python. Without a radius the box starts 1
+        degree wide and grows until it holds k places closer than its
+        edge."""
+        span = radius / KM_PER_DEGREE if radius is not None else (
+            1.0 if k is not None else 180)
+        while True:
+            span = min(span, 180)
+            if abs(lat) + span >= 90:
+                # the circle contains a pole: every longitude
+                west, east = -180, 180
+            else:
+                wide = degrees(asin(min(1, sin(radians(span)) /
+                                        cos(radians(lat)))))
+                west = (lon - wide + 180) % 360 - 180
+                east = (lon + wide + 180) % 360 - 180
+                if wide >= 180:
+                    west, east = -180, 180
+            rows = self.__session.query(Place.id, Place.latitude,
+                                        Place.longitude).filter(
+                self.__box(lat - span, west, lat + span, east))
+            pairs = sorted((distance(lat, lon, row[1], row[2]), row[0])
+                           for row in rows)
+            if radius is not None:
+                pairs = [pair for pair in pairs if pair[0] <= radius]
+            # every place closer than edge km is in the box
+            edge = span * KM_PER_DEGREE
+            if (radius is not None or span >= 180 or k is not None and
+                    len(pairs) >= k and pairs[k - 1][0] <= edge):
+                break
+            span *= 4
+        pairs = pairs[:k]
+        objs = {obj.id: obj for obj in self.__fetch(
+            Place, ["Place." + id for distance, id in pairs])}
+        return [objs[id] for distance, id in pairs if id in objs]
+
+    def __box(self, south, west, north, east):
+        """returns the SQL condition of the places inside the bounding
+        box, which crosses the antimeridian when west is greater than
+        east"""
+        lat = Place.latitude.between(south, north)
+        if west > east:
+            return sqlalchemy.and_(lat, sqlalchemy.or_(
+                Place.longitude >= west, Place.longitude <= east))
+        return sqlalchemy.and_(lat, Place.longitude.between(west, east))
+
+    def with_amenities(self, amenities):
+        """returns the places having every amenity of amenities (Amenity
+        objects or ids), ordered by id: the place ids are grouped from
+        place_amenity, keeping those linked to as many amenities as
+        asked"""
+        ids = set(getattr(amenity, "id", amenity) for amenity in amenities)
+        rows = self.__session.query(Place)
+        if ids:
+            table = Base.metadata.tables["place_amenity"]
+            linked = sqlalchemy.select(table.c.place_id).where(
+                table.c.amenity_id.in_(ids)).group_by(
+                table.c.place_id).having(sqlalchemy.func.count(
+                    table.c.amenity_id.distinct()) == len(ids))
+            rows = rows.filter(Place.id.in_(linked))
+        return list(rows.order_by(Place.id))
+
+    def __fetch(self, model, keys):
+        """returns the rows of model of the keys <class name>.<id>,
+        ordered by id"""
+        ids = sorted(key.split(".", 1)[1] for key in keys)
+        objs = []
+        for i in range(0, len(ids), 500):
+            rows = self.__session.query(model).filter(
+                model.id.in_(ids[i:i + 500])).order_by(model.id)
+            objs.extend(rows)
+        return objs
+
+    def query(self, cls):
+        """returns a Query on the rows of class cls"""
+        return Query(cls, self.__run)
+
+    def __run(self, query, count):
+        """runs query in SQL, returns its objects or their number"""
+        cls = classes[query.cls] if type(query.cls) is str else query.cls
+        rows = self.__session.query(cls)
+        if query.loads and not count:
+            rows = rows.options(*self.__loaders(cls, query.loads))
+        for name, op, value in query.filters:
+            rows = rows.filter(OPERATORS[op](getattr(cls, name), value))
+        for name, descending in query.orders:
+            column = getattr(cls, name)
+            rows = rows.order_by(column.desc() if descending else column)
+        if query.offset_count:
+            rows = rows.offset(query.offset_count)
+        if query.limit_count is not None:
+            rows = rows.limit(query.limit_count)
+        return rows.count() if count else rows.all()
+
+    def __loaders(self, model, loads):
+        """returns the loader options of the (path, strategy) pairs loads,
+        each relationship of a path loaded with its strategy"""
+        options = []
+        for path, strategy in loads:
+            option = None
+            for name in path.split("."):
+                attr = getattr(model, name)
+                loader = getattr(sqlalchemy.orm if option is None else option,
+                                 strategy + "load")
+                option = loader(attr)
+                model = attr.property.mapper.class_
+            options.append(option)
+        return options
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
 
     def save(self):
         """commit all changes of the current database session"""
-        self.__session.commit()
+        if not self.__session().info.get("batch_depth"):
+            self.__session.commit()
+
+    @contextmanager
+    def batch(self):
+        """defers every save() made in the block to one commit at its end,
+        or to a rollback if the block raises; the depth is kept in the
+        info of the session, which is the calling thread's own"""
+        info = self.__session().info
+        info["batch_depth"] = info.get("batch_depth", 0) + 1
+        try:
+            yield self
+        except BaseException:
+            info["batch_depth"] -= 1
+            if not info["batch_depth"]:
+                self.__session.rollback()
+            raise
+        info["batch_depth"] -= 1
+        if not info["batch_depth"]:
+            self.__session.commit()
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
@@ -71,6 +306,11 @@ class DBStorage:
         Session = scoped_session(sess_factory)
         self.__session = Session
 
+    def pool_stats(self):
+        """returns the checkout counters and the current state of the
+        connection pool (see TimedQueuePool.stats)"""
+        return self.__engine.pool.stats()
+
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""
+Contains the FileLock class
+"""
+
+from contextlib import contextmanager
+import os
+try:
+    import fcntl
+except ImportError:
+    # no advisory locks on this platform: FileLock only tracks nesting
+    fcntl = None
+
+
+class FileLock:
+    """advisory lock shared by every process using the same lock file
+
+    The lock is reentrant: nested blocks only take the lock once, and an
+    exclusive block nested in a shared one upgrades it for its duration.
+    A FileLock on None only tracks nesting and never touches the disk.
+    """
+
+    def __init__(self, file_path):
+        """Instantiate a FileLock on file_path, created if missing"""
+        self.file_path = file_path
+        self.__flock = fcntl is not None and file_path is not None
+        self.__fd = None
+        self.__pid = None
+        self.__modes = []
+
+    def acquire(self, exclusive=False, blocking=True):
+        """takes the lock, returns False if it is busy and not blocking"""
+        held = max(self.__modes) if self.__modes else None
+        if held is None or (exclusive and not held):
+            if self.__flock:
+                flags = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+                if not blocking:
+                    flags |= fcntl.LOCK_NB
+                try:
+                    fcntl.flock(self.__open(), flags)
+                except BlockingIOError:
+                    return False
+        self.__modes.append(exclusive)
+        return True
+
+    def release(self):
+        """releases the innermost hold of the lock"""
+        exclusive = self.__modes.pop()
+        if not self.__flock:
+            return
+        if not self.__modes:
+            fcntl.flock(self.__fd, fcntl.LOCK_UN)
+        elif exclusive and not max(self.__modes):
+            fcntl.flock(self.__fd, fcntl.LOCK_SH)
+
+    @contextmanager
+    def shared(self):
+        """holds the lock in shared mode for the block"""
+        self.acquire(False)
+        try:
+            yield self
+        finally:
+            self.release()
+
+    @contextmanager
+    def exclusive(self):
+        """holds the lock in exclusive mode for the block"""
+        self.acquire(True)
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def __open(self):
+        """returns the descriptor of the lock file, reopened after a fork"""
+        if self.__pid != os.getpid():
+            # a descriptor inherited through fork() shares its lock with
+            # the parent, so each process opens its own
+            if self.__fd is not None:
+                os.close(self.__fd)
+            self.__fd = os.open(self.file_path, os.O_RDWR | os.O_CREAT, 0o644)
+            self.__pid = os.getpid()
+        return self.__fd
@@ -3,14 +3,29 @@
 Contains the FileStorage class
 """
 
+import atexit
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
 import json
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
+from models.engine.bitmap_index import BitmapIndex
+from models.engine.file_lock import FileLock
+from models.engine.geo_index import GeoIndex
+from models.engine.query import Query
+from models.engine.rw_lock import ReadWriteLock
+from models.engine.search_index import FIELDS, SearchIndex
+from models.engine.serializers import serializers
+from models.engine.sorted_index import SortedIndex, rank
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from os import chmod, fsync, getenv, path, remove, replace, stat
+from tempfile import mkstemp
+from time import monotonic
+import zlib
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -21,50 +36,768 @@ class FileStorage:
 
     # string - path to the JSON file
     __file_path = "file.json"
+    # boolean - whether save() writes to __file_path; when False (see
+    # MemoryStorage) __file_path, if any, is only read by reload()
+    __persist = True
+    # string - snapshot format of __file_path, a key of serializers
+    __format = getenv("HBNB_FILE_FORMAT", "json")
+    # string - split the snapshot in one file per class ("class") or in
+    # that many hash shards of the key (a number); empty for one file
+    __shards = getenv("HBNB_FILE_SHARDS", "")
+    # dictionary - shard path -> keys stored in that shard
+    __members = {}
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # boolean - append changes to <__file_path>.journal instead of
+    # rewriting the whole snapshot on every save
+    __journal = getenv("HBNB_FILE_JOURNAL") == "1"
+    # integer - journal size in bytes that triggers a snapshot compaction
+    __journal_max = int(getenv("HBNB_FILE_JOURNAL_MAX", 1024 * 1024))
+    # boolean - keep the records read by reload() as raw dictionaries
+    # until their class is first accessed
+    __lazy = getenv("HBNB_FILE_LAZY") == "1"
+    # dictionary - class name -> key -> raw record not built yet
+    __pending = {}
+    # integer - snapshot size in bytes above which reload() streams the
+    # records one at a time instead of parsing the whole file at once
+    __stream_min = int(getenv("HBNB_FILE_STREAM_MIN", 64 * 1024 * 1024))
+    # string - when save() writes: "immediate", at most once per
+    # __flush_interval seconds ("interval") or once __flush_every keys
+    # are dirty ("count"); pending changes are always written at exit
+    __flush = getenv("HBNB_FILE_FLUSH", "immediate")
+    __flush_interval = float(getenv("HBNB_FILE_FLUSH_INTERVAL", 1))
+    __flush_every = int(getenv("HBNB_FILE_FLUSH_EVERY", 100))
+    # float - monotonic time of the last flush
+    __flushed_at = 0
+    # boolean - whether flush() is registered to run at exit
+    __at_exit = False
+    # integer - how many batch() blocks are open
+    __batch_depth = 0
+    # boolean - whether a save() was deferred by the open batch() blocks
+    __batched = False
+    # set - keys added or deleted since the last flush
+    __changed = set()
+    # set - keys of the stored objects whose attributes were set since
+    # they were last indexed (see touch())
+    __dirty = set()
+    # dictionary - the objects of __objects grouped by class name
+    __by_class = {}
+    # dictionary - the foreign key attributes indexed for each class
+    __foreign_keys = {"City": ("state_id",),
+                      "Place": ("city_id", "user_id"),
+                      "Review": ("place_id", "user_id")}
+    # dictionary - <class name>.<foreign key> -> parent id -> SortedIndex
+    # of the keys of the children by name
+    __children = {}
+    # dictionary - key -> {foreign key: parent id} it is indexed under
+    __parents = {}
+    # dictionary - the attributes kept ordered for each class
+    __sorted = {"Amenity": ("name",), "City": ("name",), "State": ("name",),
+                "Place": ("price_by_night", "max_guest", "number_rooms",
+                          "number_bathrooms")}
+    # dictionary - class name -> numeric attribute -> its type; __add
+    # converts the strings of these attributes like a typed column does
+    __numbers = {"Place": {"number_rooms": int, "number_bathrooms": int,
+                           "max_guest": int, "price_by_night": int,
+                           "latitude": float, "longitude": float}}
+    # dictionary - <class name>.<attribute> -> SortedIndex of the keys
+    __orders = {}
+    # dictionary - class name -> SearchIndex of the words of its FIELDS,
+    # built by the first search() on the class
+    __texts = {}
+    # dictionary - class name -> GeoIndex of its latitude and longitude,
+    # built by the first within() or nearest()
+    __spatial = {}
+    # dictionary - class name -> BitmapIndex of its amenity_ids, built by
+    # the first with_amenities()
+    __memberships = {}
+    # dictionary - class name -> sorted ids of its objects, built by the
+    # first iter() on the class
+    __ids = {}
+    # dictionary - the __objects that the indexes were built from
+    __indexed = None
+    # dictionary - path -> inode, size and mtime of the snapshot file as
+    # it was last loaded or saved
+    __loaded = {}
+    # integer - how many bytes of the journal are applied to __objects
+    __journal_offset = 0
+    # dictionary - key -> updated_at of the record last loaded or saved
+    __versions = {}
+    # dictionary - lock file path -> FileLock shared with other processes
+    __locks = {}
+    # ReadWriteLock - held for reading by all() and related() while they
+    # copy what they return, for writing by everything changing the state.
+    # It also guards the indexes above, which leave locking to their
+    # caller: any number of threads may read an index at once, but
+    # changing one needs this lock held for writing
+    __rw = ReadWriteLock()
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
-        if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
-        return self.__objects
+    def all(self, cls=None, load=()):
+        """returns the dictionary __objects, or the objects of class cls;
+        load is DBStorage's, relationships being index walks here"""
+        if cls is None:
+            return self.__read(None, lambda: self.__objects)
+        if type(cls) is not str:
+            cls = cls.__name__
+        return self.__read(cls, lambda: dict(self.__by_class.get(cls, {})))
+
+    def get(self, cls, id):
+        """returns the object of class cls and id, None if not found"""
+        if type(cls) is not str:
+            cls = cls.__name__
+        key = cls + "." + id
+        if self.__peek(lambda: key in self.__pending.get(cls, {})):
+            with self.__rw.write():
+                self.__sync()
+                record = self.__pending.get(cls, {}).get(key)
+                if record is not None:
+                    self.__add(key, classes[cls](**record))
+        return self.__peek(lambda: self.__objects.get(key))
+
+    def count(self, cls=None):
+        """returns the number of objects of class cls (default: all)"""
+        if cls is None:
+            return self.__peek(lambda: len(self.__objects) + sum(
+                len(records) for records in self.__pending.values()))
+        if type(cls) is not str:
+            cls = cls.__name__
+        return self.__peek(lambda: len(self.__by_class.get(cls, {})) +
+                           len(self.__pending.get(cls, {})))
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
             key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            with self.__rw.write():
+                self.__sync()
+                self.__add(key, obj)
+                self.__changed.add(key)
+
+    def touch(self, obj):
+        """marks obj as changed in place if it is the stored object of its
+        key, called by BaseModel whenever an attribute of obj is set"""
+        key = obj.__class__.__name__ + "." + str(obj.__dict__.get("id"))
+        if self.__objects.get(key) is obj:
+            self.__dirty.add(key)
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """serializes __objects to the JSON file, or defers it according
+        to the flush policy"""
+        with self.__rw.write():
+            if self.__batch_depth:
+                FileStorage.__batched = True
+            elif self.__due():
+                self.flush()
+            elif not self.__at_exit:
+                atexit.register(self.__flush_at_exit)
+                FileStorage.__at_exit = True
+
+    def flush(self):
+        """writes the pending changes to the JSON file (path: __file_path)
+
+        The files are locked while they are written, and what the other
+        processes committed since the last load is applied first so that
+        it is not overwritten.
+        """
+        with self.__rw.write():
+            self.__sync()
+            FileStorage.__flushed_at = monotonic()
+            self.__take_dirty()
+            if not self.__persist:
+                self.__changed.clear()
+                return
+            with self.__lock().exclusive():
+                for file_path in self.__paths():
+                    if file_path in self.__loaded:
+                        self.__load(file_path)
+                self.__write_changes()
+
+    def __write_changes(self):
+        """writes the pending changes, the lock being held"""
+        if self.__shards:
+            touched = set(self.__path_of(key) for key in self.__changed)
+            for file_path in self.__paths():
+                if file_path in touched or (
+                        self.__loaded.get(file_path) is None and
+                        self.__members.get(file_path)):
+                    self.__write(file_path)
+            self.__changed.clear()
+            return
+        if self.__journal and path.isfile(self.__file_path):
+            self.__append_journal()
+            if path.getsize(self.__journal_path()) <= self.__journal_max:
+                return
+        self.__write(self.__file_path)
+        if path.isfile(self.__journal_path()):
+            remove(self.__journal_path())
+        self.__changed.clear()
+        FileStorage.__journal_offset = 0
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
-        try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except:
-            pass
+        """deserializes the JSON file and replays its journal to __objects
+
+        Nothing is parsed when a file is the one last loaded or saved,
+        and only the records whose updated_at changed are rebuilt.
+        """
+        with self.__rw.write():
+            self.__sync()
+            if self.__file_path is None:
+                return
+            with self.__lock().shared():
+                for file_path in self.__paths():
+                    self.__load(file_path)
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
             key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            with self.__rw.write():
+                self.__sync()
+                pending = self.__pending.get(obj.__class__.__name__, {})
+                if key in self.__objects or key in pending:
+                    self.__discard(key)
+                    self.__changed.add(key)
+
+    @contextmanager
+    def batch(self):
+        """defers every save() made in the block to one flush at its end"""
+        with self.__rw.write():
+            FileStorage.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self.__rw.write():
+                FileStorage.__batch_depth -= 1
+                if not self.__batch_depth and self.__batched:
+                    FileStorage.__batched = False
+                    self.flush()
 
     def close(self):
         """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        with self.__rw.write():
+            if (self.__flush != "immediate" and self.__changed and
+                    self.__due()):
+                self.flush()
+            self.reload()
+
+    def related(self, cls, attr, parent_id):
+        """returns the list of cls instances whose attr is parent_id,
+        ordered by name"""
+        if type(cls) is not str:
+            cls = cls.__name__
+        index = self.__children
+        return self.__read(cls, lambda: list(self.__walk(
+            index.get(cls + "." + attr, {}).get(parent_id, ()))))
+
+    def iter(self, cls=None, batch_size=1000, after_id=None):
+        """yields the objects of class cls (default: every class in turn)
+        in id order, starting after the id after_id; the records kept raw
+        by a lazy reload are built batch_size at a time"""
+        if cls is None:
+            names = sorted(classes)
+        else:
+            names = [cls if type(cls) is str else cls.__name__]
+        for name in names:
+            last = after_id
+            while True:
+                objs = self.__next_batch(name, last, batch_size)
+                yield from objs
+                if len(objs) < batch_size:
+                    break
+                last = objs[-1].id
+
+    def search(self, text, cls=None, prefix=False):
+        """returns the objects of class cls (default: every class searched)
+        whose FIELDS contain every word of text, the last one only as a
+        prefix if prefix is True, ordered by key"""
+        if cls is not None and type(cls) is not str:
+            cls = cls.__name__
+        objs = []
+        for name in sorted(FIELDS):
+            if cls is None or cls == name:
+                objs.extend(self.__lookup(
+                    name, self.__texts, SearchIndex,
+                    lambda index: [self.__objects[key] for key in
+                                   sorted(index.search(text, prefix))]))
+        return objs
+
+    def within(self, south, west, north, east):
+        """returns the places inside the bounding box, which crosses the
+        antimeridian when west is greater than east"""
+        return self.__lookup("Place", self.__spatial, GeoIndex, lambda index: [
+            self.__objects[key]
+            for key in index.within(south, west, north, east)])
+
+    def nearest(self, lat, lon, k=None, radius=None):
+        """returns the k places (default: all) nearest to lat, lon and
+        within radius km (default: any distance), nearest first"""
+        return self.__lookup("Place", self.__spatial, GeoIndex, lambda index: [
+            self.__objects[key]
+            for distance, key in index.nearest(lat, lon, k, radius)])
+
+    def with_amenities(self, amenities):
+        """returns the places having every amenity of amenities (Amenity
+        objects or ids), ordered by key"""
+        ids = [getattr(amenity, "id", amenity) for amenity in amenities]
+        return self.__lookup("Place", self.__memberships, BitmapIndex,
+                             lambda index: [self.__objects[key] for key in
+                                            sorted(index.all_of(ids))])
+
+    def __lookup(self, cls, indexes, make, use):
+        """returns use(index) for the index of cls in indexes, first made
+        by make() and filled with the objects of cls if it is missing"""
+        def view():
+            """calls use on the index of cls, None if it is missing"""
+            index = indexes.get(cls)
+            return None if index is None else use(index)
+        found = self.__read(cls, view)
+        if found is None:
+            with self.__rw.write():
+                self.__sync()
+                self.__materialize(cls)
+                if cls not in indexes:
+                    indexes[cls] = make()
+                    for key, obj in self.__by_class.get(cls, {}).items():
+                        self.__reindex(cls, key, obj)
+                found = view()
+        return found
+
+    def query(self, cls):
+        """returns a Query on the objects of class cls"""
+        return Query(cls, self.__run)
+
+    def __run(self, query, count):
+        """runs query on the indexes, returns its objects or their number"""
+        cls = query.cls if type(query.cls) is str else query.cls.__name__
+
+        def view():
+            """evaluates query on the candidates of the indexes"""
+            objs, ordered = self.__candidates(cls, query)
+            if count and query.limit_count is None and not query.offset_count:
+                return sum(1 for obj in objs if query.match(obj))
+            objs = query.select(objs, ordered)
+            return len(objs) if count else objs
+        return self.__read(cls, view)
+
+    def __next_batch(self, cls, after_id, size):
+        """returns the size objects of cls following after_id in id order"""
+        with self.__rw.write():
+            self.__sync()
+            ids = self.__ids.get(cls)
+            if ids is None:
+                keys = list(self.__by_class.get(cls, {}))
+                keys.extend(self.__pending.get(cls, {}))
+                ids = sorted(key.split(".", 1)[1] for key in keys)
+                self.__ids[cls] = ids
+            start = 0 if after_id is None else bisect_right(ids, after_id)
+            keys = [cls + "." + id for id in ids[start:start + size]]
+            pending = self.__pending.get(cls, {})
+            for key in keys:
+                if key in pending:
+                    self.__add(key, classes[cls](**pending[key]))
+            return [self.__objects[key] for key in keys]
+
+    def __candidates(self, cls, query):
+        """returns the objects of cls the indexes narrow the filters of
+        query down to, and whether they already follow its order
+
+        The index read is the one of the equality or range filters that
+        holds the fewest keys, the other filters being checked on them.
+        """
+        order, descending = None, False
+        if len(query.orders) == 1:
+            order, descending = query.orders[0]
+        bounds = {}
+        best = None
+        for name, op, value in query.filters:
+            if op == "eq" and name == "id":
+                obj = self.__by_class.get(cls, {}).get(
+                    "{}.{}".format(cls, value))
+                return [] if obj is None else [obj], True
+            if op == "eq" and name in self.__foreign_keys.get(cls, ()):
+                index = self.__children.get(cls + "." + name, {})
+                children = index.get(value, ())
+                if best is None or len(children) < best[0]:
+                    best = (len(children), children, "name", None)
+            elif value is not None and cls + "." + name in self.__orders:
+                low, high = bounds.get(name, (None, None))
+                if op in ("eq", "gt", "gte"):
+                    low = value if low is None else max(low, value, key=rank)
+                if op in ("eq", "lt", "lte"):
+                    high = value if high is None else min(high, value,
+                                                          key=rank)
+                bounds[name] = (low, high)
+        for name, (low, high) in bounds.items():
+            index = self.__orders[cls + "." + name]
+            size = index.count(low, high)
+            if best is None or size < best[0]:
+                best = (size, index, name, (low, high))
+        if best is None:
+            index = self.__orders.get("{}.{}".format(cls, order))
+            if index is None:
+                return self.__by_class.get(cls, {}).values(), not query.orders
+            best = (len(index), index, order, None)
+        size, index, name, bound = best
+        reverse = descending and order == name
+        if bound is None:
+            keys = index.keys(reverse) if index else ()
+        else:
+            keys = index.range(bound[0], bound[1], reverse)
+        return ((self.__objects[key] for key in keys),
+                order == name or not query.orders)
+
+    def __walk(self, index, reverse=False):
+        """yields the objects of the keys of the SortedIndex index"""
+        for key in index.keys(reverse) if index else ():
+            yield self.__objects[key]
+
+    def __read(self, cls, view):
+        """returns view() under the read lock, once the records of cls
+        (default: all) are built and the indexes match __objects"""
+        with self.__rw.read():
+            if FileStorage.__indexed is self.__objects and not (
+                    self.__pending.get(cls) if cls is not None
+                    else any(self.__pending.values())):
+                return view()
+        with self.__rw.write():
+            self.__sync()
+            self.__materialize(cls)
+            return view()
+
+    def __peek(self, view):
+        """returns view() under the read lock once the indexes match
+        __objects, leaving the records kept raw by reload unbuilt"""
+        with self.__rw.read():
+            if FileStorage.__indexed is self.__objects:
+                return view()
+        with self.__rw.write():
+            self.__sync()
+            return view()
+
+    def __add(self, key, obj):
+        """stores obj under key in __objects and its class bucket"""
+        cls = key.split(".", 1)[0]
+        self.__objects[key] = obj
+        self.__pending.get(cls, {}).pop(key, None)
+        self.__track(key, True)
+        if self.__shards:
+            self.__members.setdefault(self.__path_of(key), {})[key] = None
+        self.__by_class.setdefault(cls, {})[key] = obj
+        self.__convert(cls, obj)
+        for attr in self.__sorted.get(cls, ()):
+            index = self.__orders.get(cls + "." + attr)
+            if index is None:
+                index = self.__orders[cls + "." + attr] = SortedIndex()
+            index.add(key, self.__value(cls, obj, attr))
+        self.__reindex(cls, key, obj)
+        name = getattr(obj, "name", None)
+        parents = self.__parents.setdefault(key, {})
+        for attr in self.__foreign_keys.get(cls, ()):
+            index = self.__children.setdefault(cls + "." + attr, {})
+            parent_id = getattr(obj, attr, None)
+            if attr in parents and parents[attr] != parent_id:
+                index[parents[attr]].discard(key)
+            if parent_id not in index:
+                index[parent_id] = SortedIndex()
+            index[parent_id].add(key, name)
+            parents[attr] = parent_id
+
+    def __discard(self, key):
+        """removes key from __objects and every index"""
+        cls = key.split(".", 1)[0]
+        self.__objects.pop(key, None)
+        self.__pending.get(cls, {}).pop(key, None)
+        self.__versions.pop(key, None)
+        self.__track(key, False)
+        if self.__shards:
+            self.__members.get(self.__path_of(key), {}).pop(key, None)
+        self.__by_class.get(cls, {}).pop(key, None)
+        for attr in self.__sorted.get(cls, ()):
+            if cls + "." + attr in self.__orders:
+                self.__orders[cls + "." + attr].discard(key)
+        for indexes in (self.__texts, self.__spatial, self.__memberships):
+            if cls in indexes:
+                indexes[cls].discard(key)
+        for attr, parent_id in self.__parents.pop(key, {}).items():
+            self.__children[cls + "." + attr][parent_id].discard(key)
+
+    def __reindex(self, cls, key, obj):
+        """updates the search, spatial and membership indexes built for
+        cls with obj"""
+        if cls in self.__texts:
+            self.__texts[cls].add(key, *[getattr(obj, attr, None)
+                                         for attr in FIELDS[cls]])
+        if cls in self.__spatial:
+            # the class defaults (0.0, 0.0) are no location
+            self.__spatial[cls].add(
+                key, self.__value(cls, obj, "latitude", own=True),
+                self.__value(cls, obj, "longitude", own=True))
+        if cls in self.__memberships:
+            self.__memberships[cls].set(key, getattr(obj, "amenity_ids",
+                                                     None) or ())
+
+    def __convert(self, cls, obj):
+        """converts the numeric attributes of obj set as numeric strings,
+        such as price_by_night="100" given to the console"""
+        for attr, kind in self.__numbers.get(cls, {}).items():
+            value = obj.__dict__.get(attr)
+            if type(value) is str:
+                try:
+                    setattr(obj, attr, kind(value))
+                except ValueError:
+                    pass
+
+    def __value(self, cls, obj, attr, own=False):
+        """returns the value of attr of obj to index, None for a numeric
+        attribute whose value is not a number, or which is not set on obj
+        itself when own is True"""
+        value = obj.__dict__.get(attr) if own else getattr(obj, attr, None)
+        if attr in self.__numbers.get(cls, {}) and (
+                type(value) is bool or not isinstance(value, (int, float))):
+            return None
+        return value
+
+    def __track(self, key, present):
+        """adds or removes the id of key in the sorted ids of its class"""
+        cls, id = key.split(".", 1)
+        ids = self.__ids.get(cls)
+        if ids is None:
+            return
+        i = bisect_left(ids, id)
+        found = i < len(ids) and ids[i] == id
+        if present and not found:
+            ids.insert(i, id)
+        elif found and not present:
+            del ids[i]
+
+    def __sync(self):
+        """rebuilds the indexes when __objects was replaced"""
+        if FileStorage.__indexed is not self.__objects:
+            self.__by_class.clear()
+            self.__pending.clear()
+            self.__members.clear()
+            self.__children.clear()
+            self.__parents.clear()
+            self.__orders.clear()
+            self.__texts.clear()
+            self.__spatial.clear()
+            self.__memberships.clear()
+            self.__dirty.clear()
+            self.__ids.clear()
+            for key, obj in self.__objects.items():
+                self.__add(key, obj)
+            FileStorage.__indexed = self.__objects
+            # what was loaded no longer describes __objects
+            self.__versions.clear()
+            self.__loaded.clear()
+
+    def __take_dirty(self):
+        """adds to __changed the keys of the objects changed in place since
+        they were last indexed, and reindexes them"""
+        dirty = self.__dirty
+        while dirty:
+            key = dirty.pop()
+            if key in self.__objects:
+                self.__add(key, self.__objects[key])
+                self.__changed.add(key)
+
+    def __due(self):
+        """tells if the flush policy wants the pending changes written"""
+        if self.__flush == "interval":
+            return monotonic() - self.__flushed_at >= self.__flush_interval
+        if self.__flush == "count":
+            return (len(self.__changed) + len(self.__dirty) >=
+                    self.__flush_every)
+        return True
+
+    def __flush_at_exit(self):
+        """writes the changes still pending when the process exits"""
+        with self.__rw.write():
+            if self.__changed or self.__dirty:
+                self.flush()
+
+    def __paths(self):
+        """returns the paths of the files the snapshot is stored in"""
+        if not self.__shards:
+            return [self.__file_path]
+        if self.__shards == "class":
+            shards = sorted(classes)
+        else:
+            shards = range(int(self.__shards))
+        root, ext = path.splitext(self.__file_path)
+        return ["{}.{}{}".format(root, shard, ext) for shard in shards]
+
+    def __path_of(self, key):
+        """returns the path of the file the record of key is stored in"""
+        if not self.__shards:
+            return self.__file_path
+        if self.__shards == "class":
+            shard = key.split(".", 1)[0]
+        else:
+            shard = zlib.crc32(key.encode()) % int(self.__shards)
+        root, ext = path.splitext(self.__file_path)
+        return "{}.{}{}".format(root, shard, ext)
+
+    def __write(self, file_path):
+        """writes the records stored in file_path"""
+        serializer = serializers[self.__format]
+        # readers see either the old or the new file, never half of it
+        fd, tmp_path = mkstemp(prefix=path.basename(file_path) + ".",
+                               dir=path.dirname(path.abspath(file_path)))
+        try:
+            with open(fd, 'w' + serializer.mode) as f:
+                serializer.dump(f, self.__records(serializer, file_path))
+                f.flush()
+                fsync(f.fileno())
+            snapshot = self.__stat(file_path)
+            chmod(tmp_path, stat(file_path).st_mode if snapshot else 0o644)
+            replace(tmp_path, file_path)
+        except BaseException:
+            remove(tmp_path)
+            raise
+        self.__loaded[file_path] = self.__stat(file_path)
+
+    def __load(self, file_path):
+        """applies the records of file_path that changed since last time"""
+        snapshot = self.__stat(file_path)
+        if snapshot is None:
+            self.__loaded[file_path] = None
+            return
+        if snapshot == self.__loaded.get(file_path):
+            if not self.__shards:
+                self.__replay_journal()
+            return
+        seen = set()
+        serializer = serializers[self.__format]
+        try:
+            with open(file_path, 'r' + serializer.mode) as f:
+                stream = snapshot[1] > self.__stream_min
+                for key, record in serializer.load(f, stream):
+                    self.__apply(key, record)
+                    seen.add(key)
+        except:
+            return
+        self.__loaded[file_path] = snapshot
+        if not self.__shards:
+            FileStorage.__journal_offset = 0
+            seen.update(self.__replay_journal())
+            keys = list(self.__versions)
+        else:
+            keys = list(self.__members.get(file_path, {}))
+        for key in keys:
+            if (key in self.__versions and key not in seen and
+                    key not in self.__changed):
+                # deleted from the file since it was last loaded
+                self.__discard(key)
+
+    def __keys(self, file_path):
+        """yields the keys stored in file_path, grouped by class"""
+        if self.__shards:
+            for key in self.__members.get(file_path, {}):
+                yield key
+            return
+        for cls in set(self.__pending).union(self.__by_class):
+            for key in self.__pending.get(cls, {}):
+                yield key
+            for key in self.__by_class.get(cls, {}):
+                yield key
+
+    def __records(self, serializer, file_path):
+        """yields the (key, record) pairs of file_path, grouped by class"""
+        for key in self.__keys(file_path):
+            if key in self.__objects:
+                record = serializer.record(self.__objects[key])
+                self.__versions[key] = record.get("updated_at")
+            else:
+                record = self.__pending[key.split(".", 1)[0]][key]
+            yield key, record
+
+    def __apply(self, key, record, newer=False):
+        """applies one loaded record, None meaning a deleted key, even if
+        its updated_at is the one loaded already when newer is True"""
+        if key in self.__changed:
+            # the pending local change wins until it is flushed
+            return
+        if record is None:
+            self.__discard(key)
+        elif (newer or key not in self.__objects or
+              self.__versions.get(key) != record.get("updated_at")):
+            if self.__lazy and key not in self.__objects:
+                pending = self.__pending.setdefault(record["__class__"], {})
+                pending[key] = record
+                self.__track(key, True)
+                if self.__shards:
+                    members = self.__members.setdefault(self.__path_of(key),
+                                                        {})
+                    members[key] = None
+            else:
+                self.__add(key, classes[record["__class__"]](**record))
+            self.__versions[key] = record.get("updated_at")
+
+    def __materialize(self, cls=None):
+        """builds the instances of cls (default: all) kept raw by reload"""
+        names = list(self.__pending) if cls is None else [cls]
+        for name in names:
+            for key, record in list(self.__pending.pop(name, {}).items()):
+                self.__add(key, classes[record["__class__"]](**record))
+
+    def __lock(self):
+        """returns the lock guarding the files of __file_path"""
+        lock_path = self.__file_path + ".lock" if self.__persist else None
+        if lock_path not in self.__locks:
+            self.__locks[lock_path] = FileLock(lock_path)
+        return self.__locks[lock_path]
+
+    def __stat(self, file_path):
+        """returns the inode, size and mtime of file_path"""
+        try:
+            st = stat(file_path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def __journal_path(self):
+        """returns the path of the journal that goes with __file_path"""
+        return self.__file_path + ".journal"
+
+    def __append_journal(self):
+        """appends the changed and deleted records as one journal line"""
+        entry = {}
+        for key in self.__changed:
+            if key in self.__objects:
+                entry[key] = self.__objects[key].to_dict()
+                self.__versions[key] = entry[key].get("updated_at")
+            else:
+                entry[key] = None
+        if entry:
+            with open(self.__journal_path(), 'ab') as f:
+                start = f.tell()
+                f.write((json.dumps(entry) + "\n").encode())
+                if start == self.__journal_offset:
+                    FileStorage.__journal_offset = f.tell()
+        self.__changed.clear()
+
+    def __replay_journal(self):
+        """applies the journal lines not applied yet, returns their keys"""
+        keys = set()
+        try:
+            with open(self.__journal_path(), 'rb') as f:
+                f.seek(self.__journal_offset)
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # a torn last line from an interrupted save
+                        break
+                    for key, value in entry.items():
+                        # a journal line is newer than what it follows,
+                        # even for a change that kept updated_at
+                        self.__apply(key, value, True)
+                        if value is None:
+                            keys.discard(key)
+                        else:
+                            keys.add(key)
+                    FileStorage.__journal_offset += len(line)
+        except OSError:
+            pass
+        return keys
@@ -0,0 +1,149 @@
+#!/usr/bin/python3
+"""
+Contains the GeoIndex class
+"""
+
+from math import asin, cos, floor, radians, sin, sqrt
+
+EARTH_RADIUS = 6371.0088
+KM_PER_DEGREE = radians(1) * EARTH_RADIUS
+
+
+def distance(lat1, lon1, lat2, lon2):
+    """returns the great-circle distance in km between two points"""
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = (sin(dlat / 2) ** 2 +
+         cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2)
+    return 2 * EARTH_RADIUS * asin(min(1, sqrt(a)))
+
+
+class GeoIndex:
+    """grid of the points indexed under each key, in cells of size
+    degrees of latitude and longitude (size should divide 360)
+
+    within() only reads the cells a bounding box covers, nearest() the
+    rings of cells around a point until no further cell can hold a
+    closer point.
+    """
+
+    def __init__(self, size=1.0):
+        """Instantiate an empty GeoIndex of size degrees cells"""
+        self.size = size
+        self.__columns = int(round(360 / size))
+        self.__cells = {}
+        self.__points = {}
+
+    def add(self, key, lat, lon):
+        """indexes key at lat, lon, or removes it if either is None"""
+        self.discard(key)
+        if lat is None or lon is None:
+            return
+        cell = self.__cell(lat, lon)
+        self.__cells.setdefault(cell, {})[key] = (lat, lon)
+        self.__points[key] = cell
+
+    def discard(self, key):
+        """removes key from the index if it is in it"""
+        cell = self.__points.pop(key, None)
+        if cell is not None:
+            del self.__cells[cell][key]
+            if not self.__cells[cell]:
+                del self.__cells[cell]
+
+    def within(self, south, west, north, east):
+        """returns the keys of the points in the bounding box, which
+        crosses the antimeridian when west is greater than east"""
+        if west > east:
+            return (self.within(south, west, north, 180) +
+                    self.within(south, -180, north, east))
+        top, left = self.__cell(south, west)
+        bottom = self.__cell(north, east)[0]
+        # east = 180 is the last column, not the first again
+        right = min(int(floor((east + 180) / self.size)), self.__columns - 1)
+        if (bottom - top + 1) * (right - left + 1) > len(self.__cells):
+            cells = [cell for cell in self.__cells
+                     if top <= cell[0] <= bottom and
+                     left <= cell[1] <= right]
+        else:
+            cells = [(i, j) for i in range(top, bottom + 1)
+                     for j in range(left, right + 1)]
+        return [key for cell in cells
+                for key, (lat, lon) in self.__cells.get(cell, {}).items()
+                if south <= lat <= north and west <= lon <= east]
+
+    def nearest(self, lat, lon, k=None, radius=None):
+        """returns the (distance in km, key) pairs of the k points
+        (default: all) nearest to lat, lon and within radius km (default:
+        any distance), nearest first"""
+        center = self.__cell(lat, lon)
+        found = []
+        ring = 0
+        while True:
+            if 8 * ring >= len(self.__cells):
+                # fewer points are left than cells in the ring: take them
+                cells = [cell for cell in self.__cells
+                         if self.__ring(center, cell) >= ring]
+                found.extend(self.__distances(cells, lat, lon, radius))
+                found.sort()
+                return found[:k]
+            cells = [cell for cell in self.__around(center, ring)
+                     if cell in self.__cells and
+                     self.__ring(center, cell) == ring]
+            found.extend(self.__distances(cells, lat, lon, radius))
+            found.sort()
+            # the points of the next rings are at least bound km away
+            bound = self.__bound(lat, ring)
+            if k is not None and len(found) >= k and found[k - 1][0] <= bound:
+                return found[:k]
+            if radius is not None and bound > radius:
+                return found[:k]
+            ring += 1
+
+    def __len__(self):
+        """returns the number of keys indexed"""
+        return len(self.__points)
+
+    def __cell(self, lat, lon):
+        """returns the (row, column) of the cell of lat, lon"""
+        return (int(floor((lat + 90) / self.size)),
+                int(floor((lon + 180) / self.size)) % self.__columns)
+
+    def __ring(self, center, cell):
+        """returns the number of cells between center and cell"""
+        columns = abs(cell[1] - center[1])
+        return max(abs(cell[0] - center[0]),
+                   min(columns, self.__columns - columns))
+
+    def __around(self, center, ring):
+        """returns the cells ring cells away from center, or closer once
+        the columns wrap around"""
+        i, j = center
+        columns = self.__columns
+        cells = set()
+        for d in range(-ring, ring + 1):
+            cells.update([(i - ring, (j + d) % columns),
+                          (i + ring, (j + d) % columns),
+                          (i + d, (j - ring) % columns),
+                          (i + d, (j + ring) % columns)])
+        return cells
+
+    def __bound(self, lat, ring):
+        """returns a lower bound of the distance from lat to the points
+        of the cells more than ring cells away"""
+        degrees = ring * self.size
+        edge = min(90, abs(lat) + degrees)
+        across = 2 * EARTH_RADIUS * asin(
+            min(1, cos(radians(edge)) * sin(radians(min(degrees, 180)) / 2)))
+        return min(degrees * KM_PER_DEGREE, across)
+
+    def __distances(self, cells, lat, lon, radius):
+        """returns the (distance, key) pairs of the points of cells that
+        are within radius of lat, lon"""
+        pairs = []
+        for cell in cells:
+            for key, point in self.__cells[cell].items():
+                d = distance(lat, lon, point[0], point[1])
+                if radius is None or d <= radius:
+                    pairs.append((d, key))
+        return pairs
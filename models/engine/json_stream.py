@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+"""
+Contains the functions reading and writing a JSON object one record at a time
+"""
+
+import json
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+
+
+def iter_records(f, chunk_size=CHUNK_SIZE):
+    """yields the (key, value) pairs of the JSON object in f one at a time
+
+    Only the record being decoded and one chunk of the file are held in
+    memory, whatever the size of the file.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    state = "start"
+    key = None
+    while True:
+        while pos < len(buf) and buf[pos] in WHITESPACE:
+            pos += 1
+        if pos == len(buf):
+            chunk = f.read(chunk_size)
+            if not chunk:
+                raise ValueError("unexpected end of JSON data")
+            buf, pos = chunk, 0
+            continue
+        if state == "start":
+            if buf[pos] != "{":
+                raise ValueError("expected a JSON object")
+            pos += 1
+            state = "first"
+        elif state in ("first", "next") and buf[pos] == "}":
+            return
+        elif state == "next":
+            if buf[pos] != ",":
+                raise ValueError("expected ',' at offset {}".format(pos))
+            pos += 1
+            state = "key"
+        elif state == "colon":
+            if buf[pos] != ":":
+                raise ValueError("expected ':' at offset {}".format(pos))
+            pos += 1
+            state = "value"
+        else:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                # the item continues in the next chunk
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            pos = end
+            if state == "value":
+                yield key, value
+                state = "next"
+            else:
+                key = value
+                state = "colon"
+
+
+def write_records(f, records):
+    """writes the (key, value) pairs of records to f as one JSON object"""
+    f.write("{")
+    sep = ""
+    for key, value in records:
+        f.write(sep + json.dumps(key) + ": " + json.dumps(value))
+        sep = ", "
+    f.write("}")
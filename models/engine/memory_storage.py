@@ -0,0 +1,20 @@
+#!/usr/bin/python3
+"""
+Contains the MemoryStorage class
+"""
+
+from models.engine.file_storage import FileStorage
+from os import getenv
+
+
+class MemoryStorage(FileStorage):
+    """keeps the objects in memory only, the disk is never written
+
+    reload() seeds the objects once from the snapshot HBNB_MEMORY_SEED
+    when it is set, in any of the FileStorage formats, lazily if
+    HBNB_FILE_LAZY is set. save() and flush() only forget the changes.
+    """
+
+    # the FileStorage attributes MemoryStorage overrides
+    _FileStorage__persist = False
+    _FileStorage__file_path = getenv("HBNB_MEMORY_SEED")
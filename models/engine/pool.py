@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""
+Contains the TimedQueuePool class
+"""
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+from threading import Lock
+from time import perf_counter
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool counting its checkouts and timing how long they take
+
+    A checkout is saturated when every connection the pool may open is
+    already checked out, so that it waits for one to be returned (or
+    times out after pool_timeout seconds). stats() returns the counters
+    along with the current state of the pool.
+    """
+
+    def __init__(self, creator, pool_size=5, max_overflow=10, **kw):
+        """Instantiate a TimedQueuePool, with QueuePool's arguments"""
+        super().__init__(creator, pool_size=pool_size,
+                         max_overflow=max_overflow, **kw)
+        # connections the pool may open at once, None when unbounded
+        self.__limit = (pool_size + max_overflow
+                        if pool_size > 0 and max_overflow >= 0 else None)
+        self.__lock = Lock()
+        self.reset_stats()
+
+    def connect(self):
+        """returns a connection of the pool, timing the checkout"""
+        saturated = (self.__limit is not None and
+                     self.checkedout() >= self.__limit)
+        start = perf_counter()
+        try:
+            conn = super().connect()
+        except TimeoutError:
+            with self.__lock:
+                self.__stats["timeouts"] += 1
+                self.__stats["saturated"] += 1
+            raise
+        elapsed = perf_counter() - start
+        with self.__lock:
+            stats = self.__stats
+            stats["checkouts"] += 1
+            stats["saturated"] += saturated
+            stats["checkout_seconds"] += elapsed
+            stats["max_checkout_seconds"] = max(
+                stats["max_checkout_seconds"], elapsed)
+            stats["peak_checked_out"] = max(stats["peak_checked_out"],
+                                            self.checkedout())
+        return conn
+
+    def stats(self):
+        """returns the dictionary of the counters and of the current size,
+        checked out, idle and overflow connections of the pool"""
+        with self.__lock:
+            stats = dict(self.__stats)
+        stats["mean_checkout_seconds"] = (
+            stats["checkout_seconds"] / stats["checkouts"]
+            if stats["checkouts"] else 0.0)
+        stats.update(size=self.size(), checked_out=self.checkedout(),
+                     idle=self.checkedin(), overflow=max(self.overflow(), 0),
+                     limit=self.__limit)
+        return stats
+
+    def reset_stats(self):
+        """sets every counter back to zero"""
+        with self.__lock:
+            self.__stats = {"checkouts": 0, "saturated": 0, "timeouts": 0,
+                            "checkout_seconds": 0.0,
+                            "max_checkout_seconds": 0.0,
+                            "peak_checked_out": 0}
@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+"""
+Contains the Query class
+"""
+
+from functools import cmp_to_key
+import heapq
+from itertools import islice
+from models.engine.sorted_index import rank
+import operator
+
+# comparison of each lookup suffix, name=value being "eq"
+OPERATORS = {"eq": operator.eq, "gt": operator.gt, "gte": operator.ge,
+             "lt": operator.lt, "lte": operator.le}
+# eager loading strategies of the relationships load() names
+STRATEGIES = ("selectin", "joined")
+
+
+class Query:
+    """chainable query on the objects of one class of a storage engine
+
+    filter() takes lookups such as name="Texas" or price_by_night__lte=100
+    (suffixes: __gt, __gte, __lt, __lte), order_by() attribute names, with
+    a leading "-" for descending order, and load() the relationships to
+    load along with the objects, such as "cities" or "cities.places"
+    (ignored by the engines whose relationships cost no query). Each call
+    returns a new Query, and nothing runs until all(), first(), count() or
+    iteration, which hand the query to the run function of the engine:
+    run(query, count) returns the list of matching objects, or their
+    number if count is True.
+    """
+
+    def __init__(self, cls, run):
+        """Instantiate a Query on cls (a class or its name) run by run"""
+        self.cls = cls
+        self.filters = []
+        self.orders = []
+        self.limit_count = None
+        self.offset_count = 0
+        self.loads = []
+        self.__run = run
+
+    def filter(self, **lookups):
+        """returns the query restricted to the objects matching lookups"""
+        filters = []
+        for lookup, value in lookups.items():
+            name, sep, op = lookup.partition("__")
+            op = op if sep else "eq"
+            if op not in OPERATORS:
+                raise ValueError("unknown lookup {}".format(lookup))
+            filters.append((name, op, value))
+        return self.__copy(filters=self.filters + filters)
+
+    def order_by(self, *names):
+        """returns the query sorted by names, "-name" sorting descending"""
+        orders = [(name.lstrip("-"), name.startswith("-")) for name in names]
+        return self.__copy(orders=self.orders + orders)
+
+    def load(self, *paths, strategy="selectin"):
+        """returns the query loading the relationships of paths (names
+        joined by dots) along with its objects, with strategy"""
+        if strategy not in STRATEGIES:
+            raise ValueError("unknown strategy {}".format(strategy))
+        loads = [(path, strategy) for path in paths]
+        return self.__copy(loads=self.loads + loads)
+
+    def limit(self, count):
+        """returns the query stopping after count objects"""
+        return self.__copy(limit_count=count)
+
+    def offset(self, count):
+        """returns the query skipping its first count objects"""
+        return self.__copy(offset_count=count)
+
+    def all(self):
+        """returns the list of the objects of the query"""
+        return self.__run(self, False)
+
+    def first(self):
+        """returns the first object of the query, None if there is none"""
+        objs = self.limit(1).all()
+        return objs[0] if objs else None
+
+    def count(self):
+        """returns the number of objects all() would return"""
+        return self.__run(self, True)
+
+    def __iter__(self):
+        """iterates on the objects of the query"""
+        return iter(self.all())
+
+    def match(self, obj):
+        """tells if obj passes every filter, a None attribute failing
+        the range filters like NULL does in SQL"""
+        for name, op, value in self.filters:
+            attr = getattr(obj, name, None)
+            if op != "eq" and attr is None:
+                return False
+            if op != "eq" and type(attr) is str and type(value) is str:
+                # strings range in the order of the sorted indexes
+                attr, value = rank(attr), rank(value)
+            try:
+                if not OPERATORS[op](attr, value):
+                    return False
+            except TypeError:
+                # values of types that do not compare never match
+                return False
+        return True
+
+    def select(self, objs, ordered=False):
+        """returns the objects of the iterable objs the query keeps, sorted
+        (unless ordered tells objs already follow the query's order) and
+        sliced: an engine without a better plan runs it in Python"""
+        objs = (obj for obj in objs if self.match(obj))
+        stop = None
+        if self.limit_count is not None:
+            stop = self.offset_count + self.limit_count
+        if ordered or not self.orders:
+            return list(islice(objs, self.offset_count, stop))
+        key = cmp_to_key(self.__compare)
+        if stop is None:
+            objs = sorted(objs, key=key)
+        else:
+            # only the first rows of the page are kept sorted
+            objs = heapq.nsmallest(stop, objs, key=key)
+        return objs[self.offset_count:stop]
+
+    def __compare(self, a, b):
+        """compares a and b on the orders of the query, in the order of
+        the ranks of their values"""
+        for name, descending in self.orders:
+            x = rank(getattr(a, name, None))
+            y = rank(getattr(b, name, None))
+            if x == y:
+                continue
+            less = x < y
+            return (1 if less else -1) if descending else (-1 if less else 1)
+        return 0
+
+    def __copy(self, **changes):
+        """returns a copy of the query with changes applied"""
+        query = Query(self.cls, self.__run)
+        query.filters = self.filters
+        query.orders = self.orders
+        query.limit_count = self.limit_count
+        query.offset_count = self.offset_count
+        query.loads = self.loads
+        for name, value in changes.items():
+            setattr(query, name, value)
+        return query
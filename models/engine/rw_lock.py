@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Contains the ReadWriteLock class
+"""
+
+from contextlib import contextmanager
+from threading import Condition, get_ident
+
+
+class ReadWriteLock:
+    """lock letting many threads read at once, or a single thread write
+
+    Readers never wait for each other, only for a writer holding or
+    waiting for the lock. Both modes are reentrant and the writer may
+    also read, but a reader cannot upgrade to writing.
+    """
+
+    def __init__(self):
+        """Instantiate a ReadWriteLock"""
+        self.__cond = Condition()
+        self.__readers = {}
+        self.__writer = None
+        self.__depth = 0
+        self.__waiting = 0
+
+    def acquire_read(self):
+        """takes the lock for reading"""
+        me = get_ident()
+        with self.__cond:
+            if self.__writer != me and me not in self.__readers:
+                while self.__writer is not None or self.__waiting:
+                    self.__cond.wait()
+            self.__readers[me] = self.__readers.get(me, 0) + 1
+
+    def release_read(self):
+        """releases one read hold of the lock"""
+        me = get_ident()
+        with self.__cond:
+            self.__readers[me] -= 1
+            if not self.__readers[me]:
+                del self.__readers[me]
+                self.__cond.notify_all()
+
+    def acquire_write(self):
+        """takes the lock for writing"""
+        me = get_ident()
+        with self.__cond:
+            if self.__writer == me:
+                self.__depth += 1
+                return
+            if me in self.__readers:
+                raise RuntimeError("cannot upgrade a read lock to writing")
+            self.__waiting += 1
+            while self.__writer is not None or self.__readers:
+                self.__cond.wait()
+            self.__waiting -= 1
+            self.__writer = me
+            self.__depth = 1
+
+    def release_write(self):
+        """releases one write hold of the lock"""
+        with self.__cond:
+            self.__depth -= 1
+            if not self.__depth:
+                self.__writer = None
+                self.__cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        """holds the lock for reading for the block"""
+        self.acquire_read()
+        try:
+            yield self
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        """holds the lock for writing for the block"""
+        self.acquire_write()
+        try:
+            yield self
+        finally:
+            self.release_write()
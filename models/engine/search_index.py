@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+"""
+Contains the SearchIndex class
+"""
+
+from models.engine.sorted_index import SortedIndex
+import re
+
+# dictionary - the attributes searched for each class
+FIELDS = {"Amenity": ("name",), "City": ("name",),
+          "Place": ("name", "description"), "Review": ("text",),
+          "State": ("name",)}
+WORD = re.compile(r"\w+")
+# sorts after every character: prefix + LAST bounds the words of prefix
+LAST = chr(0x10ffff)
+
+
+def tokenize(text):
+    """returns the list of the lowercase words of text"""
+    return WORD.findall(str(text).lower()) if text else []
+
+
+class SearchIndex:
+    """inverted index of the words of the texts indexed under each key
+
+    search() returns the keys whose texts contain every word of the
+    query, the last one possibly as a prefix for type-ahead.
+    """
+
+    def __init__(self):
+        """Instantiate an empty SearchIndex"""
+        self.__words = {}
+        self.__postings = {}
+        self.__vocabulary = SortedIndex()
+
+    def add(self, key, *texts):
+        """indexes key under the words of texts, replacing its old ones"""
+        words = frozenset(tokenize(" ".join(str(text) for text in texts
+                                            if text)))
+        old = self.__words.get(key)
+        if old == words:
+            return
+        if old:
+            for word in old - words:
+                self.__remove(word, key)
+            words_added = words - old
+        else:
+            words_added = words
+        postings = self.__postings
+        for word in words_added:
+            keys = postings.get(word)
+            if keys is None:
+                keys = postings[word] = set()
+                self.__vocabulary.add(word, word)
+            keys.add(key)
+        self.__words[key] = words
+
+    def discard(self, key):
+        """removes key from the index if it is in it"""
+        for word in self.__words.pop(key, ()):
+            self.__remove(word, key)
+
+    def search(self, text, prefix=False):
+        """returns the set of the keys whose texts have every word of
+        text, the last one only as a prefix if prefix is True"""
+        words = tokenize(text)
+        if not words:
+            return set()
+        last = words.pop() if prefix else None
+        groups = sorted((self.__postings.get(word, ()) for word in words),
+                        key=len)
+        if not groups:
+            # the range is case-folded: "strasse" is in the one of "straß"
+            return set().union(*(self.__postings[word] for word in
+                                 self.__vocabulary.range(last, last + LAST)
+                                 if word.startswith(last)))
+        keys = set(groups[0])
+        for group in groups[1:]:
+            if not keys:
+                break
+            keys &= group
+        if last is not None:
+            keys = set(key for key in keys if any(
+                word.startswith(last) for word in self.__words[key]))
+        return keys
+
+    def __len__(self):
+        """returns the number of keys indexed"""
+        return len(self.__words)
+
+    def __remove(self, word, key):
+        """removes key from the postings of word"""
+        keys = self.__postings[word]
+        keys.discard(key)
+        if not keys:
+            del self.__postings[word]
+            self.__vocabulary.discard(word)
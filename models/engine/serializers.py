@@ -0,0 +1,193 @@
+#!/usr/bin/python3
+"""
+Contains the snapshot serializers used by FileStorage
+"""
+
+from datetime import datetime, timedelta
+import json
+from models.base_model import time
+from models.engine.json_stream import iter_records, write_records
+import struct
+import sys
+
+MAGIC = b"HBNB"
+VERSION = 1
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+# tags of the binary format
+END, RECORD, BLOCK = 0, 1, 2
+
+
+class JSONSerializer:
+    """reads and writes the plain JSON snapshot (file.json)"""
+    mode = ""
+
+    def record(self, obj):
+        """returns the record written for obj"""
+        return obj.to_dict()
+
+    def dump(self, f, records):
+        """writes the (key, record) pairs of records to f"""
+        write_records(f, ((key, self.__strftime(record))
+                          for key, record in records))
+
+    def load(self, f, stream=False):
+        """returns an iterator on the (key, record) pairs read from f"""
+        if stream:
+            return iter_records(f)
+        return iter(json.load(f).items())
+
+    def __strftime(self, record):
+        """returns record with its native datetimes formatted as strings"""
+        dates = [k for k, v in record.items() if type(v) is datetime]
+        if dates:
+            record = record.copy()
+            for name in dates:
+                record[name] = record[name].strftime(time)
+        return record
+
+
+class BinarySerializer:
+    """reads and writes the compact binary snapshot
+
+    The file starts with MAGIC and a 2 bytes version. It is followed by
+    one block per run of records of the same class: BLOCK and the class
+    name, then RECORD and an attribute list per record, then END. A last
+    END closes the file. Datetimes are stored natively as microseconds
+    since EPOCH.
+    """
+    mode = "b"
+
+    def record(self, obj):
+        """returns the record written for obj, with native datetimes and
+        sets as sorted lists"""
+        record = obj.__dict__.copy()
+        record.pop("_sa_instance_state", None)
+        for name, value in record.items():
+            if type(value) is set:
+                record[name] = sorted(value)
+        record["__class__"] = obj.__class__.__name__
+        return record
+
+    def dump(self, f, records):
+        """writes the (key, record) pairs of records to f"""
+        f.write(MAGIC + struct.pack("<H", VERSION))
+        cls = None
+        for key, record in records:
+            if record["__class__"] != cls:
+                if cls is not None:
+                    f.write(bytes([END]))
+                cls = record["__class__"]
+                f.write(bytes([BLOCK]) + self.__str(cls))
+            attrs = [(k, v) for k, v in record.items() if k != "__class__"]
+            f.write(bytes([RECORD]) + struct.pack("<H", len(attrs)))
+            for name, value in attrs:
+                if name in ("created_at", "updated_at") and type(value) is str:
+                    value = datetime.strptime(value, time)
+                f.write(self.__str(name) + self.__value(value))
+        if cls is not None:
+            f.write(bytes([END]))
+        f.write(bytes([END]))
+
+    def load(self, f, stream=False):
+        """yields the (key, record) pairs read from f, always streaming"""
+        header = f.read(len(MAGIC) + 2)
+        if header[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a binary HBNB snapshot")
+        version = struct.unpack("<H", header[len(MAGIC):])[0]
+        if version != VERSION:
+            raise ValueError("unsupported snapshot version {}".format(version))
+        while True:
+            tag = f.read(1)
+            if tag == bytes([END]):
+                return
+            if tag != bytes([BLOCK]):
+                raise ValueError("corrupted snapshot: expected a block")
+            cls = self.__read_str(f)
+            while f.read(1) == bytes([RECORD]):
+                record = {}
+                for i in range(struct.unpack("<H", f.read(2))[0]):
+                    name = self.__read_str(f)
+                    record[name] = self.__read_value(f)
+                record["__class__"] = cls
+                yield cls + "." + record["id"], record
+
+    def __str(self, value):
+        """returns the length prefixed UTF-8 encoding of value"""
+        data = value.encode()
+        return struct.pack("<I", len(data)) + data
+
+    def __value(self, value):
+        """returns the tagged encoding of value"""
+        if value is None:
+            return b"N"
+        if value is True or value is False:
+            return b"T" if value else b"F"
+        if type(value) is int and -2 ** 63 <= value < 2 ** 63:
+            return b"i" + struct.pack("<q", value)
+        if type(value) is int:
+            return b"I" + self.__str(str(value))
+        if type(value) is float:
+            return b"f" + struct.pack("<d", value)
+        if type(value) is str:
+            return b"s" + self.__str(value)
+        if type(value) is datetime:
+            return b"t" + struct.pack("<q", (value - EPOCH) // MICROSECOND)
+        if type(value) in (list, tuple, set):
+            return (b"l" + struct.pack("<I", len(value)) +
+                    b"".join(self.__value(v) for v in value))
+        if type(value) is dict:
+            return (b"d" + struct.pack("<I", len(value)) +
+                    b"".join(self.__str(str(k)) + self.__value(v)
+                             for k, v in value.items()))
+        raise TypeError("cannot serialize {!r}".format(value))
+
+    def __read_str(self, f):
+        """reads a length prefixed UTF-8 string from f"""
+        size = struct.unpack("<I", f.read(4))[0]
+        return f.read(size).decode()
+
+    def __read_value(self, f):
+        """reads a tagged value from f"""
+        tag = f.read(1)
+        if tag == b"N":
+            return None
+        if tag in (b"T", b"F"):
+            return tag == b"T"
+        if tag == b"i":
+            return struct.unpack("<q", f.read(8))[0]
+        if tag == b"I":
+            return int(self.__read_str(f))
+        if tag == b"f":
+            return struct.unpack("<d", f.read(8))[0]
+        if tag == b"s":
+            return self.__read_str(f)
+        if tag == b"t":
+            return EPOCH + struct.unpack("<q", f.read(8))[0] * MICROSECOND
+        if tag == b"l":
+            size = struct.unpack("<I", f.read(4))[0]
+            return [self.__read_value(f) for i in range(size)]
+        if tag == b"d":
+            size = struct.unpack("<I", f.read(4))[0]
+            return {self.__read_str(f): self.__read_value(f)
+                    for i in range(size)}
+        raise ValueError("corrupted snapshot: unknown tag {!r}".format(tag))
+
+
+serializers = {"json": JSONSerializer(), "binary": BinarySerializer()}
+
+
+def convert(src, dst, src_format="json", dst_format="binary"):
+    """converts the snapshot src in src_format to dst in dst_format"""
+    reader = serializers[src_format]
+    writer = serializers[dst_format]
+    with open(src, "r" + reader.mode) as fin:
+        with open(dst, "w" + writer.mode) as fout:
+            writer.dump(fout, reader.load(fin, stream=True))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 5:
+        print("Usage: {} SRC SRC_FORMAT DST DST_FORMAT".format(sys.argv[0]))
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[3], sys.argv[2], sys.argv[4])
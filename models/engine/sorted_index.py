@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+"""
+Contains the SortedIndex class
+"""
+
+from bisect import bisect_left, insort
+from threading import Lock
+
+
+def rank(value):
+    """returns the sort key of value: None first, then the numbers, then
+    the other values grouped by type name, so that any values compare;
+    strings are ordered ignoring case first, like Jinja's sort filter"""
+    if value is None:
+        return (False,)
+    if isinstance(value, (int, float)):
+        return (True, "", value)
+    if isinstance(value, str):
+        return (True, "str", value.casefold(), value)
+    return (True, type(value).__name__, value)
+
+
+class SortedIndex:
+    """keys kept ordered by the rank() of a value, then by key
+
+    Added keys are buffered and merged into the order by the next read,
+    so that loading many objects costs one sort instead of one insertion
+    each.
+    """
+
+    def __init__(self):
+        """Instantiate an empty SortedIndex"""
+        self.__ranks = {}
+        self.__entries = []
+        self.__added = []
+        self.__lock = Lock()
+
+    def add(self, key, value):
+        """indexes key under value, replacing its previous value"""
+        value = rank(value)
+        if key in self.__ranks:
+            if self.__ranks[key] == value:
+                return
+            self.discard(key)
+        self.__ranks[key] = value
+        self.__added.append((value, key))
+
+    def discard(self, key):
+        """removes key from the index if it is in it"""
+        value = self.__ranks.pop(key, None)
+        if value is None:
+            return
+        self.__merge()
+        del self.__entries[bisect_left(self.__entries, (value, key))]
+
+    def keys(self, reverse=False):
+        """returns an iterator on the keys in order, or in reverse order"""
+        self.__merge()
+        entries = reversed(self.__entries) if reverse else self.__entries
+        return (key for value, key in entries)
+
+    def range(self, low=None, high=None, reverse=False):
+        """returns an iterator on the keys whose value is between low and
+        high included (None: unbounded), in order or in reverse order;
+        the keys indexed under None are in no range"""
+        start, stop = self.__bounds(low, high)
+        entries = self.__entries
+        if reverse:
+            return (entries[i][1] for i in range(stop - 1, start - 1, -1))
+        return (entries[i][1] for i in range(start, stop))
+
+    def count(self, low=None, high=None):
+        """returns the number of keys range(low, high) iterates on"""
+        start, stop = self.__bounds(low, high)
+        return max(0, stop - start)
+
+    def __iter__(self):
+        """iterates on the keys in order"""
+        return self.keys()
+
+    def __len__(self):
+        """returns the number of keys"""
+        return len(self.__ranks)
+
+    def __contains__(self, key):
+        """tells if key is indexed"""
+        return key in self.__ranks
+
+    def __bounds(self, low, high):
+        """returns the slice of the entries between low and high"""
+        self.__merge()
+        entries = self.__entries
+        start = bisect_left(entries, ((True,) if low is None
+                                      else rank(low),))
+        stop = len(entries)
+        if high is not None:
+            # rank(high) + (1,) sorts after every rank equal to rank(high)
+            stop = bisect_left(entries, (rank(high) + (1,),))
+        return start, stop
+
+    def __merge(self):
+        """sorts the buffered keys into the order"""
+        if self.__added:
+            with self.__lock:
+                added = self.__added
+                if len(added) * 32 < len(self.__entries):
+                    # a few keys: insert each rather than sort them all
+                    while added:
+                        insort(self.__entries, added[-1])
+                        added.pop()
+                elif added:
+                    # a failed sort leaves the entries as they were
+                    entries = self.__entries + added
+                    entries.sort()
+                    self.__entries = entries
+                    self.__added = []
@@ -0,0 +1,26 @@
+#!/usr/bin/python3
+"""
+Contains the class SQLiteStorage
+"""
+
+from models.engine.db_storage import DBStorage
+from os import getenv
+import sqlite3
+
+
+class SQLiteStorage(DBStorage):
+    """interacts with an embedded SQLite database in WAL mode"""
+
+    def __init__(self):
+        """Instantiate a SQLiteStorage object on HBNB_SQLITE_PATH"""
+        self.__path = getenv('HBNB_SQLITE_PATH', 'hbnb.db')
+        super().__init__('sqlite://', creator=self.__connect)
+
+    def __connect(self):
+        """opens a connection to the database file"""
+        conn = sqlite3.connect(self.__path, check_same_thread=False)
+        # readers keep reading while a writer appends to the WAL
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
@@ -1,12 +1,17 @@
 #!/usr/bin/python3
 """
-Contains the class TestConsoleDocs
+Contains the classes TestConsoleDocs and TestConsoleSearch
 """
 
 import console
 import inspect
+from io import StringIO
+import models
+from models.city import City
+from models.state import State
 import pep8
 import unittest
+from unittest import mock
 HBNBCommand = console.HBNBCommand
 
 
@@ -39,3 +44,47 @@ class TestConsoleDocs(unittest.TestCase):
                          "HBNBCommand class needs a docstring")
         self.assertTrue(len(HBNBCommand.__doc__) >= 1,
                         "HBNBCommand class needs a docstring")
+
+
+class TestConsoleSearch(unittest.TestCase):
+    """Test the search command of the console"""
+    def setUp(self):
+        """adds a state and a city to search"""
+        self.state = State(name="Zanzibar Coast")
+        self.state.save()
+        self.city = City(name="Zanzibar Town", state_id=self.state.id)
+        self.city.save()
+
+    def tearDown(self):
+        """removes the state and the city"""
+        models.storage.delete(self.city)
+        models.storage.delete(self.state)
+        models.storage.save()
+
+    def search(self, arg):
+        """returns what the search command prints for arg"""
+        with mock.patch("sys.stdout", new=StringIO()) as out:
+            HBNBCommand().onecmd("search " + arg)
+        return out.getvalue()
+
+    def test_search_words(self):
+        """Test that search prints the instances having every word"""
+        out = self.search("zanzibar")
+        self.assertIn(self.state.id, out)
+        self.assertIn(self.city.id, out)
+        out = self.search("zanzibar coast")
+        self.assertIn(self.state.id, out)
+        self.assertNotIn("[City]", out)
+
+    def test_search_class_prefix(self):
+        """Test that a class name restricts the search and that a last
+        word ending with * is a prefix"""
+        out = self.search("City zanz*")
+        self.assertNotIn("[State]", out)
+        self.assertIn(self.city.id, out)
+        self.assertEqual(self.search("State zanz"), "[]\n")
+
+    def test_search_missing(self):
+        """Test that search without words prints an error"""
+        self.assertEqual(self.search("State"),
+                         "** search words missing **\n")
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+"""
+Contains the TestBitmapIndexDocs and TestBitmapIndex classes
+"""
+
+import inspect
+from models.engine import bitmap_index
+import pep8
+import unittest
+BitmapIndex = bitmap_index.BitmapIndex
+
+
+class TestBitmapIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of BitmapIndex class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.bi_f = inspect.getmembers(BitmapIndex, inspect.isfunction)
+
+    def test_pep8_conformance_bitmap_index(self):
+        """Test that models/engine/bitmap_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/bitmap_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_bitmap_index(self):
+        """Test tests/test_models/test_bitmap_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_bitmap_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_bitmap_index_module_docstring(self):
+        """Test for the bitmap_index.py module docstring"""
+        self.assertIsNot(bitmap_index.__doc__, None,
+                         "bitmap_index.py needs a docstring")
+        self.assertTrue(len(bitmap_index.__doc__) >= 1,
+                        "bitmap_index.py needs a docstring")
+
+    def test_bitmap_index_class_docstring(self):
+        """Test for the BitmapIndex class docstring"""
+        self.assertIsNot(BitmapIndex.__doc__, None,
+                         "BitmapIndex class needs a docstring")
+        self.assertTrue(len(BitmapIndex.__doc__) >= 1,
+                        "BitmapIndex class needs a docstring")
+
+    def test_bi_func_docstrings(self):
+        """Test for the presence of docstrings in BitmapIndex methods"""
+        for func in self.bi_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestBitmapIndex(unittest.TestCase):
+    """Test the BitmapIndex class"""
+    def test_all_of(self):
+        """Test that all_of returns the keys having every member"""
+        index = BitmapIndex()
+        index.set("k1", ["wifi", "pool"])
+        index.set("k2", ["wifi"])
+        index.set("k3", ["pool", "wifi", "gym"])
+        index.set("k4", [])
+        self.assertEqual(index.all_of(["wifi"]), ["k1", "k2", "k3"])
+        self.assertEqual(index.all_of(["wifi", "pool"]), ["k1", "k3"])
+        self.assertEqual(index.all_of(["gym", "pool", "wifi"]), ["k3"])
+        self.assertEqual(index.all_of(["spa"]), [])
+        self.assertEqual(index.all_of(["spa", "wifi"]), [])
+        self.assertEqual(index.all_of([]), ["k1", "k2", "k3", "k4"])
+        self.assertEqual(index.count(["pool"]), 2)
+        self.assertEqual(index.count([]), 4)
+        self.assertEqual(len(index), 4)
+
+    def test_changes(self):
+        """Test that linking and unlinking members updates the bitmaps"""
+        index = BitmapIndex()
+        index.set("k1", ["wifi"])
+        index.set("k2", ["wifi"])
+        self.assertEqual(index.all_of(["wifi"]), ["k1", "k2"])
+        index.remove("k1", "wifi")
+        index.add("k2", "pool")
+        self.assertEqual(index.all_of(["wifi"]), ["k2"])
+        self.assertEqual(index.all_of(["pool", "wifi"]), ["k2"])
+        index.set("k2", ["pool"])
+        self.assertEqual(index.all_of(["wifi"]), [])
+        self.assertEqual(index.members("k2"), {"pool"})
+        index.remove("k9", "pool")
+        self.assertEqual(index.all_of(["pool"]), ["k2"])
+
+    def test_discard_drop(self):
+        """Test that discarded keys free their ordinal and dropped members
+        leave every key"""
+        index = BitmapIndex()
+        index.set("k1", ["wifi", "pool"])
+        index.set("k2", ["wifi"])
+        index.discard("k1")
+        index.discard("k9")
+        self.assertEqual(index.all_of(["wifi"]), ["k2"])
+        self.assertEqual(index.all_of([]), ["k2"])
+        index.set("k3", ["pool"])
+        self.assertEqual(index.all_of(["pool"]), ["k3"])
+        self.assertEqual(index.all_of(["wifi"]), ["k2"])
+        self.assertEqual(len(index), 2)
+        index.drop("wifi")
+        self.assertEqual(index.all_of(["wifi"]), [])
+        self.assertEqual(index.members("k2"), set())
+
+    def test_many(self):
+        """Test the bitmaps against sets on many keys"""
+        index = BitmapIndex()
+        members = {}
+        for i in range(1000):
+            key = "k{:04d}".format(i)
+            members[key] = {m for m in range(5) if i % (m + 2) == 0}
+            index.set(key, members[key])
+        for i in range(0, 1000, 3):
+            key = "k{:04d}".format(i)
+            index.discard(key)
+            del members[key]
+        for wanted in [{0}, {0, 1}, {1, 3}, {0, 1, 2, 3, 4}]:
+            expected = sorted(key for key, found in members.items()
+                              if wanted <= found)
+            self.assertEqual(sorted(index.all_of(wanted)), expected)
+            self.assertEqual(index.count(wanted), len(expected))
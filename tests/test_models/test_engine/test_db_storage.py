@@ -17,7 +17,10 @@ from models.user import User
 import json
 import os
 import pep8
+from sqlalchemy import event
+import threading
 import unittest
+from unittest import mock
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
            "Review": Review, "State": State, "User": User}
@@ -86,3 +89,309 @@ class TestFileStorage(unittest.TestCase):
     @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
     def test_save(self):
         """Test that save properly saves objects to file.json"""
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_count(self):
+        """Test that get finds a row by id and count counts the rows"""
+        states = models.storage.count(State)
+        total = models.storage.count()
+        state = State(name="California")
+        state.save()
+        try:
+            self.assertIs(models.storage.get(State, state.id), state)
+            self.assertIs(models.storage.get("State", state.id), state)
+            self.assertIsNone(models.storage.get(City, state.id))
+            self.assertIsNone(models.storage.get("Nowhere", state.id))
+            self.assertEqual(models.storage.count(State), states + 1)
+            self.assertEqual(models.storage.count("State"), states + 1)
+            # a class name built at runtime is not the interned literal
+            name = "".join(["St", "ate"])
+            self.assertEqual(models.storage.count(name), states + 1)
+            self.assertEqual(models.storage.count(), total + 1)
+        finally:
+            models.storage.delete(state)
+            models.storage.save()
+        self.assertIsNone(models.storage.get(State, state.id))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_iter(self):
+        """Test that iter pages through the rows in id order"""
+        states = [State(name="Iter") for i in range(5)]
+        for state in states:
+            models.storage.new(state)
+        models.storage.save()
+        try:
+            ids = [s.id for s in models.storage.iter(State, batch_size=2)]
+            self.assertEqual(ids, sorted(ids))
+            self.assertEqual(len(ids), models.storage.count(State))
+            for state in states:
+                self.assertIn(state.id, ids)
+            after = [s.id for s in models.storage.iter(
+                "State", batch_size=2, after_id=ids[1])]
+            self.assertEqual(after, ids[2:])
+            name = "".join(["St", "ate"])
+            self.assertEqual([s.id for s in models.storage.iter(name)], ids)
+        finally:
+            for state in states:
+                models.storage.delete(state)
+            models.storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_search(self):
+        """Test that search finds the rows and follows the flushes"""
+        state = State(name="Zanzibar Coast")
+        state.save()
+        try:
+            self.assertEqual(models.storage.search("zanzibar"), [state])
+            self.assertEqual(models.storage.search("zanz", prefix=True),
+                             [state])
+            other = State(name="Zanzibar Islands")
+            other.save()
+            state.name = "Dar es Salaam"
+            state.save()
+            self.assertEqual(models.storage.search("zanzibar", State),
+                             [other])
+            self.assertEqual(models.storage.search("salaam"), [state])
+            name = "".join(["St", "ate"])
+            self.assertEqual(models.storage.search("salaam", name), [state])
+            models.storage.delete(other)
+            models.storage.save()
+            self.assertEqual(models.storage.search("zanzibar"), [])
+            self.assertEqual(models.storage.search("dar_es"), [])
+            with self.assertRaises(ValueError):
+                with models.storage.batch():
+                    models.storage.delete(state)
+                    models.storage._DBStorage__session.flush()
+                    raise ValueError
+            self.assertEqual(models.storage.search("salaam"), [state])
+        finally:
+            models.storage.delete(state)
+            models.storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_batch_threads(self):
+        """Test that a batch only defers the saves of its own thread"""
+        entered, saved = threading.Event(), threading.Event()
+        states = {}
+
+        def batch():
+            """saves a state in a batch left open until the other saved"""
+            with models.storage.batch():
+                states["a"] = State(name="Batched")
+                states["a"].save()
+                entered.set()
+                saved.wait(5)
+            models.storage.close()
+
+        def save():
+            """saves a state while the batch is open, then ends its
+            session"""
+            entered.wait(5)
+            states["b"] = State(name="Alone")
+            states["b"].save()
+            models.storage.close()
+            saved.set()
+        threads = [threading.Thread(target=f) for f in [batch, save]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        models.storage.close()
+        try:
+            for state in states.values():
+                self.assertIsNotNone(models.storage.get(State, state.id))
+        finally:
+            for state in states.values():
+                found = models.storage.get(State, state.id)
+                if found is not None:
+                    models.storage.delete(found)
+            models.storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_within_nearest(self):
+        """Test the spatial queries through inserts, moves and deletes"""
+        state = State(name="Antarctica")
+        city = City(name="Base", state_id=state.id)
+        user = User(email="a@b.c", password="pwd")
+        for obj in [state, city, user]:
+            models.storage.new(obj)
+        models.storage.save()
+        paris = Place(name="Paris", city_id=city.id, user_id=user.id,
+                      latitude=-48.86, longitude=2.35)
+        paris.save()
+        try:
+            self.assertEqual(models.storage.within(-50, 0, -48, 5), [paris])
+            london = Place(name="London", city_id=city.id, user_id=user.id,
+                           latitude=-51.51, longitude=-0.13)
+            london.save()
+            self.assertEqual(models.storage.nearest(-51, 0, k=2),
+                             [london, paris])
+            self.assertEqual(models.storage.nearest(-49, 2, radius=100),
+                             [paris])
+            self.assertEqual(models.storage.nearest(-51, 178), [london, paris])
+            self.assertEqual(models.storage.within(-52, 170, -48, 1),
+                             [london])
+            with self.assertRaises(ValueError):
+                with models.storage.batch():
+                    models.storage.new(Place(
+                        name="Ghost", city_id=city.id, user_id=user.id,
+                        latitude=-49, longitude=3))
+                    models.storage._DBStorage__session.flush()
+                    raise ValueError
+            self.assertEqual(models.storage.within(-50, 0, -48, 5), [paris])
+            london.latitude = -60
+            london.save()
+            models.storage.delete(paris)
+            models.storage.save()
+            self.assertEqual(models.storage.within(-61, -1, -48, 5),
+                             [london])
+            models.storage.delete(london)
+            models.storage.save()
+        finally:
+            for obj in [paris, city, state, user]:
+                if models.storage.get(type(obj), obj.id) is not None:
+                    models.storage.delete(obj)
+            models.storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_with_amenities(self):
+        """Test the amenity filter through links, unlinks and deletes"""
+        state = State(name="Antarctica")
+        city = City(name="Base", state_id=state.id)
+        user = User(email="a@b.c", password="pwd")
+        wifi, pool = Amenity(name="Wifi"), Amenity(name="Pool")
+        for obj in [state, city, user, wifi, pool]:
+            models.storage.new(obj)
+        models.storage.save()
+        both = Place(name="Both", city_id=city.id, user_id=user.id)
+        one = Place(name="One", city_id=city.id, user_id=user.id)
+        both.amenities.extend([wifi, pool])
+        one.amenities.append(wifi)
+        for place in [both, one]:
+            models.storage.new(place)
+        models.storage.save()
+        keys = [(type(obj), obj.id)
+                for obj in [both, one, wifi, pool, city, state, user]]
+        try:
+            self.assertEqual(models.storage.with_amenities([wifi, pool]),
+                             [both])
+            self.assertEqual(models.storage.with_amenities([wifi.id]),
+                             sorted([both, one], key=lambda p: p.id))
+            one.amenities.remove(wifi)
+            pool.place_amenities.append(one)
+            models.storage.save()
+            self.assertEqual(models.storage.with_amenities([wifi]), [both])
+            self.assertEqual(models.storage.with_amenities([pool]),
+                             sorted([both, one], key=lambda p: p.id))
+            with self.assertRaises(ValueError):
+                with models.storage.batch():
+                    one.amenities.append(wifi)
+                    models.storage._DBStorage__session.flush()
+                    raise ValueError
+            self.assertEqual(models.storage.with_amenities([wifi]), [both])
+            # a link committed by another connection, as another worker
+            table = db_storage.Base.metadata.tables["place_amenity"]
+            engine = models.storage._DBStorage__engine
+            with engine.begin() as conn:
+                conn.execute(table.insert().values(place_id=keys[1][1],
+                                                   amenity_id=keys[2][1]))
+            models.storage.close()
+            both, one, wifi, pool = [models.storage.get(cls, id)
+                                     for cls, id in keys[:4]]
+            self.assertEqual(models.storage.with_amenities([wifi]),
+                             sorted([both, one], key=lambda p: p.id))
+            models.storage.delete(wifi)
+            models.storage.delete(both)
+            models.storage.save()
+            self.assertEqual(models.storage.with_amenities([wifi]), [])
+            self.assertEqual(models.storage.with_amenities([pool]), [one])
+        finally:
+            for cls, id in keys:
+                obj = models.storage.get(cls, id)
+                if obj is not None:
+                    models.storage.delete(obj)
+            models.storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pool_options(self):
+        """Test that HBNB_DB_POOL_* configure the pool, options first"""
+        env = {"HBNB_DB_POOL_SIZE": "3", "HBNB_DB_POOL_MAX_OVERFLOW": "2",
+               "HBNB_DB_POOL_TIMEOUT": "4.5", "HBNB_DB_POOL_RECYCLE": "60",
+               "HBNB_DB_POOL_PRE_PING": "1", "HBNB_ENV": ""}
+        with mock.patch.dict(os.environ, env):
+            storage = DBStorage("sqlite://", pool_recycle=90)
+        pool = storage._DBStorage__engine.pool
+        self.assertEqual(pool.size(), 3)
+        self.assertEqual(pool.timeout(), 4.5)
+        self.assertEqual(pool._recycle, 90)
+        self.assertTrue(pool._pre_ping)
+        self.assertEqual(storage.pool_stats()["limit"], 5)
+        self.assertGreater(models.storage.pool_stats()["checkouts"], 0)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_query_load(self):
+        """Test that loading cities with the states takes one query more,
+        whatever the number of states"""
+        states = [State(name="~" + str(i)) for i in range(3)]
+        cities = [City(name=str(i), state_id=state.id)
+                  for state in states for i in range(2)]
+        for obj in states + cities:
+            models.storage.new(obj)
+        models.storage.save()
+        engine = models.storage._DBStorage__engine
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            """records a statement run on the engine"""
+            statements.append(statement)
+        try:
+            for load, expected in [((), 4), (("cities",), 2),
+                                   (("cities.places",), 3)]:
+                models.storage.close()
+                event.listen(engine, "before_cursor_execute", count)
+                query = models.storage.query(State).filter(name__gt="~")
+                found = query.order_by("name").load(*load).all()
+                self.assertEqual([len(s.cities) for s in found], [2, 2, 2])
+                event.remove(engine, "before_cursor_execute", count)
+                self.assertEqual(len(statements), expected)
+                statements.clear()
+            models.storage.close()
+            found = models.storage.all(State, load=["cities"])
+            self.assertEqual(len(found["State." + states[0].id].cities), 2)
+        finally:
+            if event.contains(engine, "before_cursor_execute", count):
+                event.remove(engine, "before_cursor_execute", count)
+            models.storage.close()
+            for obj in cities + states:
+                models.storage.delete(models.storage.get(type(obj), obj.id))
+            models.storage.save()
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_place_range_indexes(self):
+        """Test that the filtered Place columns are indexed"""
+        indexed = [list(index.columns)[0].name
+                   for index in Place.__table__.indexes]
+        for name in ["price_by_night", "max_guest", "number_rooms",
+                     "number_bathrooms"]:
+            self.assertIn(name, indexed)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_query(self):
+        """Test that query filters, orders and slices the rows in SQL"""
+        states = [State(name=name) for name in ["~Utah", "~Ohio", "~Iowa"]]
+        for state in states:
+            models.storage.new(state)
+        models.storage.save()
+        try:
+            query = models.storage.query(State).filter(name__gt="~")
+            query = query.order_by("name")
+            self.assertEqual([s.name for s in query],
+                             ["~Iowa", "~Ohio", "~Utah"])
+            self.assertEqual(query.offset(1).limit(1).first(), states[1])
+            self.assertEqual(query.filter(name__gt="~Iowa").count(), 2)
+            self.assertEqual(models.storage.query("State").filter(
+                id=states[2].id).all(), [states[2]])
+        finally:
+            for state in states:
+                models.storage.delete(state)
+            models.storage.save()
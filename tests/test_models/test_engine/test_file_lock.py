@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""
+Contains the TestFileLockDocs and TestFileLock classes
+"""
+
+import inspect
+from models.engine import file_lock
+import os
+import pep8
+import unittest
+FileLock = file_lock.FileLock
+
+
+class TestFileLockDocs(unittest.TestCase):
+    """Tests to check the documentation and style of FileLock class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.fl_f = inspect.getmembers(FileLock, inspect.isfunction)
+
+    def test_pep8_conformance_file_lock(self):
+        """Test that models/engine/file_lock.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/file_lock.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_file_lock(self):
+        """Test tests/test_models/test_file_lock.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_file_lock.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_file_lock_module_docstring(self):
+        """Test for the file_lock.py module docstring"""
+        self.assertIsNot(file_lock.__doc__, None,
+                         "file_lock.py needs a docstring")
+        self.assertTrue(len(file_lock.__doc__) >= 1,
+                        "file_lock.py needs a docstring")
+
+    def test_file_lock_class_docstring(self):
+        """Test for the FileLock class docstring"""
+        self.assertIsNot(FileLock.__doc__, None,
+                         "FileLock class needs a docstring")
+        self.assertTrue(len(FileLock.__doc__) >= 1,
+                        "FileLock class needs a docstring")
+
+    def test_fl_func_docstrings(self):
+        """Test for the presence of docstrings in FileLock methods"""
+        for func in self.fl_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(file_lock.fcntl is None, "no advisory locks")
+class TestFileLock(unittest.TestCase):
+    """Test the FileLock class"""
+    def tearDown(self):
+        """Removes the lock file"""
+        if os.path.isfile("test.lock"):
+            os.remove("test.lock")
+
+    def test_exclusive(self):
+        """Test that an exclusive lock keeps out the other holders"""
+        lock = FileLock("test.lock")
+        other = FileLock("test.lock")
+        with lock.exclusive():
+            self.assertFalse(other.acquire(False, blocking=False))
+            self.assertFalse(other.acquire(True, blocking=False))
+        self.assertTrue(other.acquire(True, blocking=False))
+        other.release()
+
+    def test_shared(self):
+        """Test that shared locks only keep out exclusive holders"""
+        lock = FileLock("test.lock")
+        other = FileLock("test.lock")
+        with lock.shared():
+            self.assertTrue(other.acquire(False, blocking=False))
+            other.release()
+            self.assertFalse(other.acquire(True, blocking=False))
+
+    def test_nested(self):
+        """Test that nested holds release the lock with the outermost"""
+        lock = FileLock("test.lock")
+        other = FileLock("test.lock")
+        with lock.shared():
+            with lock.exclusive():
+                self.assertFalse(other.acquire(False, blocking=False))
+            self.assertTrue(other.acquire(False, blocking=False))
+            other.release()
+        self.assertTrue(other.acquire(True, blocking=False))
+        other.release()
@@ -4,6 +4,7 @@ Contains the TestFileStorageDocs classes
 """
 
 from datetime import datetime
+import glob
 import inspect
 import models
 from models.engine import file_storage
@@ -15,8 +16,10 @@ from models.review import Review
 from models.state import State
 from models.user import User
 import json
+import multiprocessing
 import os
 import pep8
+import threading
 import unittest
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
@@ -70,6 +73,26 @@ test_file_storage.py'])
 
 class TestFileStorage(unittest.TestCase):
     """Test the FileStorage class"""
+    # the class attributes of FileStorage that the tests change
+    attrs = ["objects", "file_path", "format", "journal", "shards", "lazy",
+             "stream_min", "flush", "flush_every"]
+
+    def setUp(self):
+        """saves the attributes of FileStorage and empties __objects"""
+        self.saved = {attr: getattr(FileStorage, "_FileStorage__" + attr)
+                      for attr in self.attrs}
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        """restores the attributes of FileStorage and removes the file,
+        shards, lock and journal written by the test"""
+        root = os.path.splitext(FileStorage._FileStorage__file_path)[0]
+        for attr, value in self.saved.items():
+            setattr(FileStorage, "_FileStorage__" + attr, value)
+        if root != os.path.splitext(self.saved["file_path"])[0]:
+            for name in glob.glob(root + ".*"):
+                os.remove(name)
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_all_returns_dict(self):
         """Test that all returns the FileStorage.__objects attr"""
@@ -113,3 +136,571 @@ class TestFileStorage(unittest.TestCase):
         with open("file.json", "r") as f:
             js = f.read()
         self.assertEqual(json.loads(string), json.loads(js))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_journal(self):
+        """Test that journaled saves append changes that reload replays"""
+        storage = FileStorage()
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__file_path = "test_journal.json"
+        state = State(name="California")
+        city = City(name="Fremont")
+        storage.new(state)
+        storage.save()
+        storage.new(city)
+        storage.save()
+        storage.delete(state)
+        storage.save()
+        with open("test_journal.json.journal", "r") as f:
+            self.assertEqual(len(f.readlines()), 2)
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(list(storage.all()), ["City." + city.id])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_journal_in_place(self):
+        """Test that journaled saves keep the objects changed in place"""
+        storage = FileStorage()
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__file_path = "test_journal.json"
+        state = State(name="Old")
+        other = State(name="Nevada")
+        storage.new(state)
+        storage.new(other)
+        storage.save()
+        state.name = "New"
+        storage.save()
+        with open("test_journal.json.journal", "r") as f:
+            entry = json.loads(f.readlines()[-1])
+        self.assertEqual(list(entry), ["State." + state.id])
+        self.assertEqual([s.name for s in storage.query(State).order_by(
+            "name")], ["Nevada", "New"])
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name, "New")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_touch(self):
+        """Test that setting an attribute marks only stored objects, and
+        that save reindexes them"""
+        storage = FileStorage()
+        state = State(name="Old")
+        storage.new(state)
+        storage.save()
+        dirty = FileStorage._FileStorage__dirty
+        self.assertEqual(dirty, set())
+        State(name="Loose").name = "Free"
+        self.assertEqual(dirty, set())
+        state.name = "New"
+        self.assertEqual(dirty, {"State." + state.id})
+        storage.save()
+        self.assertEqual(dirty, set())
+        self.assertEqual(storage.query(State).filter(name="New").all(),
+                         [state])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_amenities_setter(self):
+        """Test that the amenities linked with the Place setter are saved
+        by journaled and sharded saves and reach the amenity filter"""
+        storage = FileStorage()
+        FileStorage._FileStorage__file_path = "test_amenities.json"
+        for journal, shards in [(True, ""), (False, "class")]:
+            FileStorage._FileStorage__objects = {}
+            FileStorage._FileStorage__journal = journal
+            FileStorage._FileStorage__shards = shards
+            wifi = Amenity(name="Wifi")
+            place = Place(name="Home")
+            storage.new(wifi)
+            storage.new(place)
+            storage.save()
+            self.assertEqual(storage.with_amenities([wifi]), [])
+            place.amenities = wifi
+            storage.save()
+            self.assertEqual(storage.with_amenities([wifi]), [place])
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(storage.get(Place, place.id).amenity_ids,
+                             {wifi.id})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_cls(self):
+        """Test that all(cls) returns only the objects of cls"""
+        storage = FileStorage()
+        state = State()
+        city = City()
+        storage.new(state)
+        storage.new(city)
+        expected = {"State." + state.id: state}
+        self.assertEqual(storage.all(State), expected)
+        self.assertEqual(storage.all("State"), expected)
+        self.assertEqual(storage.all(Amenity), {})
+        storage.delete(state)
+        self.assertEqual(storage.all(State), {})
+        self.assertEqual(len(storage.all()), 1)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_count(self):
+        """Test that get and count see new, deleted and lazy objects"""
+        storage = FileStorage()
+        FileStorage._FileStorage__file_path = "test_get.json"
+        state = State(name="California")
+        storage.new(state)
+        storage.new(City(state_id=state.id))
+        self.assertIs(storage.get(State, state.id), state)
+        self.assertIs(storage.get("State", state.id), state)
+        self.assertIsNone(storage.get(City, state.id))
+        self.assertEqual(storage.count(), 2)
+        self.assertEqual(storage.count(State), 1)
+        self.assertEqual(storage.count("Amenity"), 0)
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        storage.reload()
+        self.assertEqual(storage.count(), 2)
+        self.assertEqual(storage._FileStorage__objects, {})
+        self.assertEqual(storage.get(State, state.id).name, "California")
+        self.assertEqual(len(storage._FileStorage__objects), 1)
+        self.assertEqual(storage.count(City), 1)
+        storage.delete(storage.get(State, state.id))
+        self.assertIsNone(storage.get(State, state.id))
+        self.assertEqual(storage.count(), 1)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_query(self):
+        """Test that query filters, orders and slices the objects"""
+        storage = FileStorage()
+        states = [State(name=name) for name in ["Utah", "Ohio", "Iowa"]]
+        for state in states:
+            storage.new(state)
+        city = City(state_id=states[0].id, name="Provo")
+        storage.new(city)
+        storage.new(City(state_id=states[1].id, name="Akron"))
+        query = storage.query(State).order_by("name")
+        self.assertEqual([s.name for s in query], ["Iowa", "Ohio", "Utah"])
+        self.assertEqual(query.limit(1).offset(1).first(), states[1])
+        self.assertEqual(query.filter(name__gt="Iowa").count(), 2)
+        self.assertEqual(storage.query("City").filter(
+            state_id=states[0].id).all(), [city])
+        self.assertEqual(storage.query(State).filter(
+            id=states[2].id).all(), [states[2]])
+        self.assertEqual(storage.query(State).filter(id="no").count(), 0)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_query_mixed_types(self):
+        """Test that a name that is not a string breaks neither the
+        ordered listings nor delete"""
+        storage = FileStorage()
+        states = [State(name=name) for name in ["Utah", 5, "Iowa"]]
+        for state in states:
+            storage.new(state)
+        query = storage.query(State).order_by("name")
+        self.assertEqual([s.name for s in query], [5, "Iowa", "Utah"])
+        self.assertEqual(query.filter(name__gt="J").count(), 1)
+        storage.delete(states[0])
+        self.assertEqual([s.name for s in query], [5, "Iowa"])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_query_ranges(self):
+        """Test that range filters on indexed attributes match a scan"""
+        storage = FileStorage()
+        places = [Place(price_by_night=i * 10 % 97, max_guest=i % 7,
+                        city_id=str(i % 3)) for i in range(100)]
+        for place in places:
+            storage.new(place)
+        places[0].price_by_night = 500
+        storage.new(places[0])
+        for lookups in [{"price_by_night__gte": 20,
+                         "price_by_night__lt": 50},
+                        {"price_by_night__gt": 40, "max_guest__gte": 6},
+                        {"max_guest": 3, "city_id": "1"},
+                        {"price_by_night__lte": 10, "max_guest__lt": 0}]:
+            query = storage.query(Place).filter(**lookups)
+            expected = [p for p in places if query.match(p)]
+            self.assertEqual(sorted(query.all(), key=id),
+                             sorted(expected, key=id))
+            self.assertEqual(query.count(), len(expected))
+        query = storage.query(Place).filter(price_by_night__gte=90)
+        prices = [p.price_by_night for p in query.order_by(
+            "-price_by_night").limit(3)]
+        self.assertEqual(prices, [500, 96, 95])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_sorted_names(self):
+        """Test that names stay ordered through new, renames and delete"""
+        storage = FileStorage()
+        state = State(name="Texas")
+        storage.new(state)
+        cities = [City(state_id=state.id, name=name)
+                  for name in ["Waco", "Austin", "Dallas"]]
+        for city in cities:
+            storage.new(city)
+        self.assertEqual([c.name for c in storage.related(
+            City, "state_id", state.id)], ["Austin", "Dallas", "Waco"])
+        cities[0].name = "Abilene"
+        storage.new(cities[0])
+        storage.delete(cities[2])
+        self.assertEqual([c.name for c in storage.related(
+            City, "state_id", state.id)], ["Abilene", "Austin"])
+        query = storage.query(City).order_by("-name")
+        self.assertEqual([c.name for c in query], ["Austin", "Abilene"])
+        self.assertEqual(query.offset(1).first(), cities[0])
+        index = storage._FileStorage__orders["City.name"]
+        self.assertEqual(len(index), 2)
+        for name in ["Zed", "apple"]:
+            storage.new(City(state_id=state.id, name=name))
+        self.assertEqual([c.name for c in storage.related(
+            City, "state_id", state.id)],
+            ["Abilene", "apple", "Austin", "Zed"])
+        self.assertEqual([c.name for c in query],
+                         ["Zed", "Austin", "apple", "Abilene"])
+        self.assertEqual([c.name for c in storage.query(City).filter(
+            name__gt="austin").filter(name__lt="zz")], ["Zed"])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search(self):
+        """Test that search finds words and follows new and delete"""
+        storage = FileStorage()
+        state = State(name="New Mexico")
+        city = City(name="Mexico City")
+        storage.new(state)
+        storage.new(city)
+        self.assertEqual(storage.search("mexico"), [city, state])
+        self.assertEqual(storage.search("new mex", prefix=True),
+                         [state])
+        self.assertEqual(storage.search("mexico", State), [state])
+        self.assertEqual(storage.search("mexico", "User"), [])
+        review = Review(text="Close to Mexico")
+        storage.new(review)
+        self.assertEqual(storage.search("mexico", Review), [review])
+        city.name = "Juarez"
+        storage.new(city)
+        storage.delete(state)
+        self.assertEqual(storage.search("mexico"), [review])
+        self.assertEqual(storage.search("juarez"), [city])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_query_numeric_strings(self):
+        """Test that numeric attributes given as strings are converted,
+        and that those which are not numbers are left out of the ranges"""
+        storage = FileStorage()
+        typed = Place(price_by_night=80)
+        text = Place(price_by_night="100", latitude="1.5",
+                     longitude="2.5")
+        bad = Place(price_by_night="cheap")
+        for place in [typed, text, bad]:
+            storage.new(place)
+        self.assertEqual(text.price_by_night, 100)
+        self.assertEqual(text.latitude, 1.5)
+        query = storage.query(Place).filter(price_by_night__lte=150)
+        self.assertEqual(query.order_by("price_by_night").all(),
+                         [typed, text])
+        self.assertEqual(storage.within(1, 2, 2, 3), [text])
+        storage.delete(text)
+        storage.delete(bad)
+        self.assertEqual(query.all(), [typed])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_within_nearest(self):
+        """Test the spatial queries through new, moves and delete"""
+        storage = FileStorage()
+        paris = Place(name="Paris", latitude=48.86, longitude=2.35)
+        london = Place(name="London", latitude=51.51, longitude=-0.13)
+        storage.new(paris)
+        storage.new(london)
+        self.assertEqual(storage.within(48, 0, 50, 5), [paris])
+        self.assertEqual(storage.nearest(51, 0), [london, paris])
+        self.assertEqual(storage.nearest(49, 2, radius=100), [paris])
+        lyon = Place(name="Lyon", latitude=45.76, longitude=4.84)
+        storage.new(lyon)
+        self.assertEqual(storage.nearest(46, 5, k=2), [lyon, paris])
+        london.latitude, london.longitude = 40.71, -74.01
+        storage.new(london)
+        storage.delete(paris)
+        self.assertEqual(storage.nearest(51, 0, k=1), [lyon])
+        self.assertEqual(storage.within(40, -75, 41, -73), [london])
+        nowhere = Place(name="Nowhere")
+        storage.new(nowhere)
+        self.assertEqual(storage.within(-1, -1, 1, 1), [])
+        self.assertNotIn(nowhere, storage.nearest(0, 0, k=5))
+        nowhere.latitude, nowhere.longitude = 0.5, 0.5
+        storage.new(nowhere)
+        self.assertEqual(storage.within(-1, -1, 1, 1), [nowhere])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_with_amenities(self):
+        """Test the amenity filter through new, relinks and delete"""
+        storage = FileStorage()
+        wifi, pool = Amenity(name="Wifi"), Amenity(name="Pool")
+        both = Place(name="Both", amenity_ids=[wifi.id, pool.id])
+        one = Place(name="One", amenity_ids=[wifi.id])
+        none = Place(name="None")
+        for place in [both, one, none]:
+            storage.new(place)
+        self.assertEqual(storage.with_amenities([wifi, pool]), [both])
+        self.assertEqual(storage.with_amenities([wifi.id]),
+                         sorted([both, one], key=lambda p: p.id))
+        one.amenity_ids = [pool.id]
+        storage.new(one)
+        storage.delete(both)
+        self.assertEqual(storage.with_amenities([pool]), [one])
+        self.assertEqual(storage.with_amenities([wifi]), [])
+        self.assertEqual(len(storage.with_amenities([])), 2)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iter(self):
+        """Test that iter yields the objects in id order, batch by batch"""
+        storage = FileStorage()
+        FileStorage._FileStorage__file_path = "test_iter.json"
+        states = [State() for i in range(5)]
+        for state in states:
+            storage.new(state)
+        storage.new(City())
+        ids = sorted(state.id for state in states)
+        objs = list(storage.iter(State, batch_size=2))
+        self.assertEqual([obj.id for obj in objs], ids)
+        self.assertEqual([obj.id for obj in storage.iter(
+            "State", after_id=ids[2])], ids[3:])
+        self.assertEqual(len(list(storage.iter())), 6)
+        storage.delete(states[0])
+        state = State()
+        storage.new(state)
+        self.assertIn(state, list(storage.iter(State)))
+        self.assertNotIn(states[0], list(storage.iter(State)))
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        storage.reload()
+        first = next(storage.iter(State, batch_size=1))
+        self.assertEqual(list(storage._FileStorage__objects),
+                         ["State." + first.id])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_related(self):
+        """Test that related follows new, delete and foreign key changes"""
+        storage = FileStorage()
+        state = State()
+        other = State()
+        city = City(state_id=state.id)
+        storage.new(city)
+        self.assertEqual(storage.related(City, "state_id", state.id),
+                         [city])
+        city.state_id = other.id
+        storage.new(city)
+        self.assertEqual(storage.related(City, "state_id", state.id), [])
+        self.assertEqual(storage.related("City", "state_id", other.id),
+                         [city])
+        storage.delete(city)
+        self.assertEqual(storage.related(City, "state_id", other.id), [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_unchanged(self):
+        """Test that reload only rebuilds the records that changed"""
+        storage = FileStorage()
+        FileStorage._FileStorage__file_path = "test_reload.json"
+        state = State(name="California")
+        gone = State(name="Nevada")
+        storage.new(state)
+        storage.new(gone)
+        storage.save()
+        storage.reload()
+        self.assertIs(storage.all()["State." + state.id], state)
+        with open("test_reload.json", "r") as f:
+            js = json.load(f)
+        js["State." + state.id]["name"] = "Arizona"
+        js["State." + state.id]["updated_at"] = "2030-01-01T00:00:00.0"
+        del js["State." + gone.id]
+        with open("test_reload.json", "w") as f:
+            json.dump(js, f, indent=1)
+        storage.close()
+        self.assertEqual(list(storage.all()), ["State." + state.id])
+        self.assertEqual(storage.all()["State." + state.id].name,
+                         "Arizona")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_lazy(self):
+        """Test that lazy reload builds instances on first access"""
+        storage = FileStorage()
+        FileStorage._FileStorage__file_path = "test_reload.json"
+        state = State(name="California")
+        city = City(state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        storage.reload()
+        self.assertEqual(storage._FileStorage__objects, {})
+        self.assertEqual(list(storage.all(State)), ["State." + state.id])
+        self.assertEqual(len(storage._FileStorage__objects), 1)
+        storage.save()
+        with open("test_reload.json", "r") as f:
+            self.assertIn("City." + city.id, json.load(f))
+        self.assertEqual(len(storage.all()), 2)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_stream(self):
+        """Test that reload streams the records of a large file"""
+        storage = FileStorage()
+        FileStorage._FileStorage__file_path = "test_reload.json"
+        state = State(name="California")
+        storage.new(state)
+        storage.new(City(state_id=state.id))
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__stream_min = 0
+        storage.reload()
+        self.assertEqual(len(storage.all()), 2)
+        self.assertEqual(storage.all(State)["State." + state.id].name,
+                         "California")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_binary(self):
+        """Test that save and reload work with the binary format"""
+        storage = FileStorage()
+        FileStorage._FileStorage__format = "binary"
+        FileStorage._FileStorage__file_path = "test_binary.bin"
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        loaded = storage.all(State)["State." + state.id]
+        self.assertEqual(loaded.name, "California")
+        self.assertEqual(loaded.updated_at, state.updated_at)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_sharded(self):
+        """Test that a sharded save only rewrites the touched shards"""
+        storage = FileStorage()
+        FileStorage._FileStorage__shards = "class"
+        FileStorage._FileStorage__file_path = "test_shard.json"
+        state = State(name="California")
+        storage.new(state)
+        storage.new(City(state_id=state.id))
+        storage.save()
+        with open("test_shard.State.json", "r") as f:
+            self.assertEqual(list(json.load(f)), ["State." + state.id])
+        mtime = os.stat("test_shard.State.json").st_mtime_ns
+        storage.new(Review())
+        storage.save()
+        self.assertTrue(os.path.isfile("test_shard.Review.json"))
+        self.assertEqual(os.stat("test_shard.State.json").st_mtime_ns,
+                         mtime)
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(len(storage.all()), 3)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_sharded_in_place(self):
+        """Test that a sharded save rewrites the shards of the objects
+        changed in place, and only those"""
+        storage = FileStorage()
+        FileStorage._FileStorage__shards = "class"
+        FileStorage._FileStorage__file_path = "test_shard.json"
+        state = State(name="Old")
+        storage.new(state)
+        storage.new(City(name="Fremont"))
+        storage.save()
+        mtime = os.stat("test_shard.City.json").st_mtime_ns
+        state.name = "New"
+        storage.save()
+        self.assertEqual(os.stat("test_shard.City.json").st_mtime_ns,
+                         mtime)
+        FileStorage._FileStorage__objects = {}
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name, "New")
+
+    @unittest.skipIf(models.storage_engine == 'memory',
+                     "memory storage never writes")
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_flush_policy(self):
+        """Test that save defers writes until the flush policy is met"""
+        storage = FileStorage()
+        FileStorage._FileStorage__file_path = "test_flush.json"
+        FileStorage._FileStorage__flush = "count"
+        FileStorage._FileStorage__flush_every = 3
+        for i in range(2):
+            State(name=str(i)).save()
+        self.assertFalse(os.path.isfile("test_flush.json"))
+        State(name="2").save()
+        with open("test_flush.json", "r") as f:
+            self.assertEqual(len(json.load(f)), 3)
+        State(name="3").save()
+        storage.flush()
+        with open("test_flush.json", "r") as f:
+            self.assertEqual(len(json.load(f)), 4)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_batch(self):
+        """Test that batch writes the saves of the block once at its end"""
+        storage = FileStorage()
+        FileStorage._FileStorage__file_path = "test_batch.json"
+        with storage.batch():
+            for i in range(3):
+                State(name=str(i)).save()
+            self.assertFalse(os.path.isfile("test_batch.json"))
+        with open("test_batch.json", "r") as f:
+            self.assertEqual(len(json.load(f)), 3)
+
+    @unittest.skipIf(models.storage_engine == 'memory',
+                     "memory storage never writes")
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    @unittest.skipIf("fork" not in multiprocessing.get_all_start_methods(),
+                     "needs fork")
+    def test_save_processes(self):
+        """Test that processes saving the same file keep each other's data"""
+        storage = FileStorage()
+        FileStorage._FileStorage__file_path = "test_processes.json"
+        storage.save()
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_save_states, args=(10,))
+                   for i in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        storage.reload()
+        self.assertEqual(len(storage.all(State)), 30)
+
+
+def _save_states(count):
+    """saves count new states, run in a child process"""
+    for i in range(count):
+        State(name=str(i)).save()
+
+
+class TestFileStorageThreads(unittest.TestCase):
+    """Test FileStorage used from several threads"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iterate_while_writing(self):
+        """Test that all(cls) can be iterated while other threads write"""
+        storage = FileStorage()
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__objects = {}
+        errors = []
+
+        def write():
+            """adds and removes states"""
+            for i in range(500):
+                state = State()
+                storage.new(state)
+                storage.delete(state)
+
+        def read():
+            """iterates over the states"""
+            try:
+                for i in range(500):
+                    for key, state in storage.all(State).items():
+                        pass
+            except Exception as e:
+                errors.append(e)
+        try:
+            threads = [threading.Thread(target=f) for f in [write, read] * 2]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(errors, [])
+            self.assertEqual(storage.all(State), {})
+        finally:
+            FileStorage._FileStorage__objects = save
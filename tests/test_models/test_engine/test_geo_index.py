@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+"""
+Contains the TestGeoIndexDocs and TestGeoIndex classes
+"""
+
+import inspect
+from models.engine import geo_index
+import pep8
+import random
+import unittest
+GeoIndex = geo_index.GeoIndex
+
+
+class TestGeoIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of GeoIndex class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.geo_f = inspect.getmembers(GeoIndex, inspect.isfunction)
+
+    def test_pep8_conformance_geo_index(self):
+        """Test that models/engine/geo_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/geo_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_geo_index(self):
+        """Test tests/test_models/test_geo_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_geo_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_geo_index_module_docstring(self):
+        """Test for the geo_index.py module docstring"""
+        self.assertIsNot(geo_index.__doc__, None,
+                         "geo_index.py needs a docstring")
+        self.assertTrue(len(geo_index.__doc__) >= 1,
+                        "geo_index.py needs a docstring")
+
+    def test_geo_index_class_docstring(self):
+        """Test for the GeoIndex class docstring"""
+        self.assertIsNot(GeoIndex.__doc__, None,
+                         "GeoIndex class needs a docstring")
+        self.assertTrue(len(GeoIndex.__doc__) >= 1,
+                        "GeoIndex class needs a docstring")
+
+    def test_geo_func_docstrings(self):
+        """Test for the presence of docstrings in GeoIndex methods"""
+        for func in self.geo_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestGeoIndex(unittest.TestCase):
+    """Test the GeoIndex class"""
+    def setUp(self):
+        """indexes random points, some around the antimeridian"""
+        rand = random.Random(0)
+        self.index = GeoIndex(5)
+        self.points = {}
+        for i in range(600):
+            if i % 3:
+                point = (rand.uniform(-90, 90), rand.uniform(-180, 180))
+            else:
+                lon = rand.uniform(175, 185)
+                point = (rand.uniform(10, 20), lon - 360 if lon > 180 else lon)
+            self.points[i] = point
+            self.index.add(i, *point)
+        for i in range(0, 600, 7):
+            self.index.discard(i)
+            del self.points[i]
+
+    def test_distance(self):
+        """Test the great-circle distance"""
+        self.assertAlmostEqual(geo_index.distance(0, 0, 0, 1), 111.195, 3)
+        self.assertAlmostEqual(geo_index.distance(10, 179.5, 10, -179.5),
+                               109.5, 1)
+
+    def test_within(self):
+        """Test that within returns the points of the box"""
+        boxes = [(-30, -60, 45, 90), (10, 170, 20, -170), (-90, -180, 90, 180)]
+        for box in boxes:
+            south, west, north, east = box
+            expected = [key for key, (lat, lon) in self.points.items()
+                        if south <= lat <= north and
+                        (west <= lon <= east if west <= east
+                         else lon >= west or lon <= east)]
+            self.assertEqual(sorted(self.index.within(*box)),
+                             sorted(expected))
+
+    def test_nearest(self):
+        """Test that nearest matches a scan of every point"""
+        for lat, lon, k, radius in [(15, 179.9, 5, None),
+                                    (15, -179.9, None, 300),
+                                    (-80, 20, 3, None), (0, 0, 10, 2000),
+                                    (89, 0, 1, None)]:
+            pairs = sorted((geo_index.distance(lat, lon, *point), key)
+                           for key, point in self.points.items())
+            if radius is not None:
+                pairs = [pair for pair in pairs if pair[0] <= radius]
+            self.assertEqual(self.index.nearest(lat, lon, k, radius),
+                             pairs[:k])
+
+    def test_add_none(self):
+        """Test that a point without coordinates is not indexed"""
+        self.index.add(1, None, 10)
+        self.assertNotIn(1, self.index.within(-90, -180, 90, 180))
+        self.assertEqual(len(self.index), len(self.points) - 1)
@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""
+Contains the TestJsonStreamDocs and TestJsonStream classes
+"""
+
+import inspect
+import io
+import json
+from models.engine import json_stream
+import pep8
+import unittest
+
+
+class TestJsonStreamDocs(unittest.TestCase):
+    """Tests to check the documentation and style of json_stream"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.js_f = inspect.getmembers(json_stream, inspect.isfunction)
+
+    def test_pep8_conformance_json_stream(self):
+        """Test that models/engine/json_stream.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/json_stream.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_json_stream(self):
+        """Test tests/test_models/test_json_stream.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_json_stream.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_json_stream_module_docstring(self):
+        """Test for the json_stream.py module docstring"""
+        self.assertIsNot(json_stream.__doc__, None,
+                         "json_stream.py needs a docstring")
+        self.assertTrue(len(json_stream.__doc__) >= 1,
+                        "json_stream.py needs a docstring")
+
+    def test_js_func_docstrings(self):
+        """Test for the presence of docstrings in json_stream functions"""
+        for func in self.js_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestJsonStream(unittest.TestCase):
+    """Test the json_stream functions"""
+    def test_iter_records(self):
+        """Test that iter_records yields the same pairs as json.load"""
+        data = {"State.1": {"name": 'a " } b', "ids": [1, 2.5, None]},
+                "City.2": {"name": "{,:}"}, "User.3": {}}
+        text = json.dumps(data, indent=2)
+        for size in [1, 3, 1024]:
+            with self.subTest(size=size):
+                records = json_stream.iter_records(io.StringIO(text), size)
+                self.assertEqual(list(records), list(data.items()))
+
+    def test_iter_records_empty(self):
+        """Test that iter_records accepts an empty object"""
+        self.assertEqual(list(json_stream.iter_records(io.StringIO("{}"))),
+                         [])
+
+    def test_iter_records_truncated(self):
+        """Test that iter_records raises ValueError on truncated data"""
+        f = io.StringIO('{"State.1": {"name": "a"}, "City.2": {"na')
+        with self.assertRaises(ValueError):
+            list(json_stream.iter_records(f, 4))
+
+    def test_write_records(self):
+        """Test that write_records writes what json.dump would"""
+        data = {"State.1": {"name": "a"}, "City.2": {"state_id": "1"}}
+        f = io.StringIO()
+        json_stream.write_records(f, data.items())
+        self.assertEqual(f.getvalue(), json.dumps(data))
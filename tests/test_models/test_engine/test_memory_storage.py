@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+Contains the TestMemoryStorageDocs and TestMemoryStorage classes
+"""
+
+import inspect
+import json
+import models
+from models.engine import memory_storage
+from models.engine.file_storage import FileStorage
+from models.state import State
+import os
+import pep8
+import unittest
+MemoryStorage = memory_storage.MemoryStorage
+
+
+class TestMemoryStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of MemoryStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.ms_f = inspect.getmembers(MemoryStorage, inspect.isfunction)
+
+    def test_pep8_conformance_memory_storage(self):
+        """Test that models/engine/memory_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/memory_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_memory_storage(self):
+        """Test tests/test_models/test_memory_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_memory_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_memory_storage_module_docstring(self):
+        """Test for the memory_storage.py module docstring"""
+        self.assertIsNot(memory_storage.__doc__, None,
+                         "memory_storage.py needs a docstring")
+        self.assertTrue(len(memory_storage.__doc__) >= 1,
+                        "memory_storage.py needs a docstring")
+
+    def test_memory_storage_class_docstring(self):
+        """Test for the MemoryStorage class docstring"""
+        self.assertIsNot(MemoryStorage.__doc__, None,
+                         "MemoryStorage class needs a docstring")
+        self.assertTrue(len(MemoryStorage.__doc__) >= 1,
+                        "MemoryStorage class needs a docstring")
+
+    def test_ms_func_docstrings(self):
+        """Test for the presence of docstrings in MemoryStorage methods"""
+        for func in self.ms_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestMemoryStorage(unittest.TestCase):
+    """Test the MemoryStorage class"""
+    def setUp(self):
+        """records the files of the working directory"""
+        self.files = os.listdir(".")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_no_file(self):
+        """Test that save keeps the objects without writing any file"""
+        storage = MemoryStorage()
+        save = FileStorage._FileStorage__objects
+        seed = MemoryStorage._FileStorage__file_path
+        FileStorage._FileStorage__objects = {}
+        MemoryStorage._FileStorage__file_path = None
+        try:
+            state = State(name="California")
+            storage.new(state)
+            storage.save()
+            storage.reload()
+            self.assertIs(storage.all(State)["State." + state.id], state)
+            self.assertEqual(os.listdir("."), self.files)
+        finally:
+            FileStorage._FileStorage__objects = save
+            MemoryStorage._FileStorage__file_path = seed
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_seed(self):
+        """Test that reload loads the seed snapshot and never writes it"""
+        storage = MemoryStorage()
+        save = FileStorage._FileStorage__objects
+        seed = MemoryStorage._FileStorage__file_path
+        FileStorage._FileStorage__objects = {}
+        MemoryStorage._FileStorage__file_path = "test_seed.json"
+        state = State(name="Nevada")
+        with open("test_seed.json", "w") as f:
+            json.dump({"State." + state.id: state.to_dict()}, f)
+        try:
+            storage.reload()
+            self.assertEqual(storage.all(State)["State." + state.id].name,
+                             "Nevada")
+            storage.new(State(name="Arizona"))
+            storage.save()
+            with open("test_seed.json", "r") as f:
+                self.assertEqual(len(json.load(f)), 1)
+            self.assertFalse(os.path.isfile("test_seed.json.lock"))
+        finally:
+            FileStorage._FileStorage__objects = save
+            MemoryStorage._FileStorage__file_path = seed
+            os.remove("test_seed.json")
@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""
+Contains the TestTimedQueuePoolDocs and TestTimedQueuePool classes
+"""
+
+import inspect
+from models.engine import pool
+import pep8
+from sqlalchemy.exc import TimeoutError
+import sqlite3
+import unittest
+TimedQueuePool = pool.TimedQueuePool
+
+
+class TestTimedQueuePoolDocs(unittest.TestCase):
+    """Tests to check the documentation and style of TimedQueuePool class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        # the methods inherited from QueuePool are SQLAlchemy's
+        cls.pool_f = [(name, func) for name, func in
+                      vars(TimedQueuePool).items() if inspect.isfunction(func)]
+
+    def test_pep8_conformance_pool(self):
+        """Test that models/engine/pool.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_pool(self):
+        """Test tests/test_models/test_pool.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pool_module_docstring(self):
+        """Test for the pool.py module docstring"""
+        self.assertIsNot(pool.__doc__, None,
+                         "pool.py needs a docstring")
+        self.assertTrue(len(pool.__doc__) >= 1,
+                        "pool.py needs a docstring")
+
+    def test_pool_class_docstring(self):
+        """Test for the TimedQueuePool class docstring"""
+        self.assertIsNot(TimedQueuePool.__doc__, None,
+                         "TimedQueuePool class needs a docstring")
+        self.assertTrue(len(TimedQueuePool.__doc__) >= 1,
+                        "TimedQueuePool class needs a docstring")
+
+    def test_pool_func_docstrings(self):
+        """Test for the presence of docstrings in TimedQueuePool methods"""
+        for func in self.pool_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestTimedQueuePool(unittest.TestCase):
+    """Test the TimedQueuePool class"""
+    def test_stats(self):
+        """Test that checkouts are counted and the state reported"""
+        pool = TimedQueuePool(lambda: sqlite3.connect(":memory:"),
+                              pool_size=2, max_overflow=1)
+        first, second = pool.connect(), pool.connect()
+        stats = pool.stats()
+        self.assertEqual(stats["checkouts"], 2)
+        self.assertEqual(stats["checked_out"], 2)
+        self.assertEqual(stats["peak_checked_out"], 2)
+        self.assertEqual(stats["limit"], 3)
+        self.assertEqual(stats["saturated"], 0)
+        self.assertGreaterEqual(stats["max_checkout_seconds"],
+                                stats["mean_checkout_seconds"])
+        first.close()
+        second.close()
+        stats = pool.stats()
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["idle"], 2)
+        pool.reset_stats()
+        self.assertEqual(pool.stats()["checkouts"], 0)
+        pool.dispose()
+
+    def test_saturated(self):
+        """Test that a checkout of a full pool is counted as saturated,
+        and as a timeout when none is returned in time"""
+        pool = TimedQueuePool(lambda: sqlite3.connect(":memory:"),
+                              pool_size=1, max_overflow=0, timeout=0.05)
+        conn = pool.connect()
+        with self.assertRaises(TimeoutError):
+            pool.connect()
+        stats = pool.stats()
+        self.assertEqual(stats["checkouts"], 1)
+        self.assertEqual(stats["saturated"], 1)
+        self.assertEqual(stats["timeouts"], 1)
+        conn.close()
+        pool.connect().close()
+        self.assertEqual(pool.stats()["checkouts"], 2)
+        pool.dispose()
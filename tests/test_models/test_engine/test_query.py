@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""
+Contains the TestQueryDocs and TestQuery classes
+"""
+
+import inspect
+from models.engine import query
+import pep8
+import unittest
+Query = query.Query
+
+
+class Row:
+    """object with the attributes it is instantiated with"""
+    def __init__(self, **kwargs):
+        """Instantiate a Row"""
+        self.__dict__.update(kwargs)
+
+
+class TestQueryDocs(unittest.TestCase):
+    """Tests to check the documentation and style of Query class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.query_f = inspect.getmembers(Query, inspect.isfunction)
+
+    def test_pep8_conformance_query(self):
+        """Test that models/engine/query.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/query.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_query(self):
+        """Test tests/test_models/test_query.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_query.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_query_module_docstring(self):
+        """Test for the query.py module docstring"""
+        self.assertIsNot(query.__doc__, None,
+                         "query.py needs a docstring")
+        self.assertTrue(len(query.__doc__) >= 1,
+                        "query.py needs a docstring")
+
+    def test_query_class_docstring(self):
+        """Test for the Query class docstring"""
+        self.assertIsNot(Query.__doc__, None,
+                         "Query class needs a docstring")
+        self.assertTrue(len(Query.__doc__) >= 1,
+                        "Query class needs a docstring")
+
+    def test_query_func_docstrings(self):
+        """Test for the presence of docstrings in Query methods"""
+        for func in self.query_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestQuery(unittest.TestCase):
+    """Test the Query class"""
+    def setUp(self):
+        """builds rows and a query selecting among them"""
+        self.rows = [Row(name=name, price=price) for name, price in
+                     [("b", 30), ("a", 10), ("d", None), ("c", 20)]]
+        self.query = Query("Row", lambda q, count: q.select(self.rows))
+
+    def test_filter(self):
+        """Test the equality and range lookups"""
+        self.assertEqual([r.name for r in self.query.filter(name="c")],
+                         ["c"])
+        self.assertEqual([r.name for r in self.query.filter(price__gte=20)],
+                         ["b", "c"])
+        self.assertEqual([r.name for r in self.query.filter(price__lt=20)],
+                         ["a"])
+        self.assertEqual(self.query.filter(price=None).first().name, "d")
+        with self.assertRaises(ValueError):
+            self.query.filter(price__near=1)
+
+    def test_order_limit_offset(self):
+        """Test the ordering and slicing of the objects"""
+        names = [r.name for r in self.query.order_by("price")]
+        self.assertEqual(names, ["d", "a", "c", "b"])
+        names = [r.name for r in self.query.order_by("-price")]
+        self.assertEqual(names, ["b", "c", "a", "d"])
+        page = self.query.order_by("name").offset(1).limit(2)
+        self.assertEqual([r.name for r in page], ["b", "c"])
+        self.assertEqual(len(self.query.offset(3).all()), 1)
+
+    def test_chain_copies(self):
+        """Test that each call returns a new query"""
+        filtered = self.query.filter(price__gt=10)
+        self.assertEqual(len(self.query.all()), 4)
+        self.assertEqual(len(filtered.all()), 2)
+        self.assertEqual(len(filtered.filter(name="b").all()), 1)
+
+    def test_load(self):
+        """Test that load records its paths and checks their strategy"""
+        query = self.query.load("cities", "cities.places")
+        query = query.load("amenities", strategy="joined")
+        self.assertEqual(query.loads, [("cities", "selectin"),
+                                       ("cities.places", "selectin"),
+                                       ("amenities", "joined")])
+        self.assertEqual(self.query.loads, [])
+        self.assertEqual(len(query.filter(price__gt=10).all()), 2)
+        with self.assertRaises(ValueError):
+            self.query.load("cities", strategy="lazy")
+
+    def test_mixed_types(self):
+        """Test that values of different types sort and filter without
+        raising, numbers before strings"""
+        self.rows.append(Row(name=5, price="7"))
+        names = [r.name for r in self.query.order_by("name")]
+        self.assertEqual(names, [5, "a", "b", "c", "d"])
+        names = [r.name for r in self.query.filter(name__gt="b")]
+        self.assertEqual(names, ["d", "c"])
+        self.assertEqual(len(self.query.filter(price__gt=15).all()), 2)
+
+    def test_ignore_case(self):
+        """Test that strings sort and range ignoring case first"""
+        self.rows.append(Row(name="B", price=None))
+        names = [r.name for r in self.query.order_by("name")]
+        self.assertEqual(names, ["a", "B", "b", "c", "d"])
+        names = [r.name for r in self.query.filter(name__gte="B")]
+        self.assertEqual(names, ["b", "d", "c", "B"])
+        names = [r.name for r in self.query.filter(name__lt="C")]
+        self.assertEqual(names, ["b", "a", "B"])
@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""
+Contains the TestReadWriteLockDocs and TestReadWriteLock classes
+"""
+
+import inspect
+from models.engine import rw_lock
+import pep8
+import threading
+import unittest
+ReadWriteLock = rw_lock.ReadWriteLock
+
+
+class TestReadWriteLockDocs(unittest.TestCase):
+    """Tests to check the documentation and style of ReadWriteLock class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.rw_f = inspect.getmembers(ReadWriteLock, inspect.isfunction)
+
+    def test_pep8_conformance_rw_lock(self):
+        """Test that models/engine/rw_lock.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/rw_lock.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_rw_lock(self):
+        """Test tests/test_models/test_rw_lock.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_rw_lock.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_rw_lock_module_docstring(self):
+        """Test for the rw_lock.py module docstring"""
+        self.assertIsNot(rw_lock.__doc__, None,
+                         "rw_lock.py needs a docstring")
+        self.assertTrue(len(rw_lock.__doc__) >= 1,
+                        "rw_lock.py needs a docstring")
+
+    def test_rw_lock_class_docstring(self):
+        """Test for the ReadWriteLock class docstring"""
+        self.assertIsNot(ReadWriteLock.__doc__, None,
+                         "ReadWriteLock class needs a docstring")
+        self.assertTrue(len(ReadWriteLock.__doc__) >= 1,
+                        "ReadWriteLock class needs a docstring")
+
+    def test_rw_func_docstrings(self):
+        """Test for the presence of docstrings in ReadWriteLock methods"""
+        for func in self.rw_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestReadWriteLock(unittest.TestCase):
+    """Test the ReadWriteLock class"""
+    def test_readers_share(self):
+        """Test that a reader does not wait for another reader"""
+        lock = ReadWriteLock()
+        entered = threading.Event()
+
+        def read():
+            """takes the lock for reading in another thread"""
+            with lock.read():
+                entered.set()
+        with lock.read():
+            thread = threading.Thread(target=read)
+            thread.start()
+            self.assertTrue(entered.wait(5))
+        thread.join()
+
+    def test_writer_excludes(self):
+        """Test that a writer waits for the reader to leave"""
+        lock = ReadWriteLock()
+        entered = threading.Event()
+
+        def write():
+            """takes the lock for writing in another thread"""
+            with lock.write():
+                entered.set()
+        with lock.read():
+            thread = threading.Thread(target=write)
+            thread.start()
+            self.assertFalse(entered.wait(0.1))
+        self.assertTrue(entered.wait(5))
+        thread.join()
+
+    def test_reentrant(self):
+        """Test that the writer can write and read again"""
+        lock = ReadWriteLock()
+        with lock.write():
+            with lock.write():
+                with lock.read():
+                    pass
+        with lock.read():
+            with lock.read():
+                with self.assertRaises(RuntimeError):
+                    lock.acquire_write()
@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+"""
+Contains the TestSearchIndexDocs and TestSearchIndex classes
+"""
+
+import inspect
+from models.engine import search_index
+import pep8
+import unittest
+SearchIndex = search_index.SearchIndex
+
+
+class TestSearchIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SearchIndex class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.search_f = inspect.getmembers(SearchIndex, inspect.isfunction)
+
+    def test_pep8_conformance_search_index(self):
+        """Test that models/engine/search_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/search_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_search_index(self):
+        """Test tests/test_models/test_search_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_search_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_search_index_module_docstring(self):
+        """Test for the search_index.py module docstring"""
+        self.assertIsNot(search_index.__doc__, None,
+                         "search_index.py needs a docstring")
+        self.assertTrue(len(search_index.__doc__) >= 1,
+                        "search_index.py needs a docstring")
+
+    def test_search_index_class_docstring(self):
+        """Test for the SearchIndex class docstring"""
+        self.assertIsNot(SearchIndex.__doc__, None,
+                         "SearchIndex class needs a docstring")
+        self.assertTrue(len(SearchIndex.__doc__) >= 1,
+                        "SearchIndex class needs a docstring")
+
+    def test_search_func_docstrings(self):
+        """Test for the presence of docstrings in SearchIndex methods"""
+        for func in self.search_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test the SearchIndex class"""
+    def setUp(self):
+        """indexes a few texts"""
+        self.index = SearchIndex()
+        self.index.add("k1", "Sunny loft", "Great view of the bay")
+        self.index.add("k2", "Bayside house", None)
+        self.index.add("k3", "THE VIEW")
+
+    def test_search(self):
+        """Test that every word must match, whatever its case"""
+        self.assertEqual(self.index.search("view"), {"k1", "k3"})
+        self.assertEqual(self.index.search("the view bay"), {"k1"})
+        self.assertEqual(self.index.search("bay"), {"k1"})
+        self.assertEqual(self.index.search("castle"), set())
+        self.assertEqual(self.index.search(""), set())
+
+    def test_search_prefix(self):
+        """Test that the last word matches as a prefix"""
+        self.assertEqual(self.index.search("bay", prefix=True), {"k1", "k2"})
+        self.assertEqual(self.index.search("view th", prefix=True),
+                         {"k1", "k3"})
+        self.assertEqual(self.index.search("loft vi", prefix=True), {"k1"})
+
+    def test_add_discard(self):
+        """Test that replacing or removing texts updates the index"""
+        self.index.add("k3", "castle")
+        self.assertEqual(self.index.search("view"), {"k1"})
+        self.assertEqual(self.index.search("castle"), {"k3"})
+        self.index.discard("k1")
+        self.index.discard("missing")
+        self.assertEqual(self.index.search("view"), set())
+        self.assertEqual(self.index.search("b", prefix=True), {"k2"})
+        self.assertEqual(len(self.index), 2)
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+"""
+Contains the TestSerializersDocs and TestSerializers classes
+"""
+
+from datetime import datetime
+import inspect
+import io
+import json
+import models
+from models.engine import serializers
+from models.place import Place
+from models.state import State
+import os
+import pep8
+import unittest
+
+
+class TestSerializersDocs(unittest.TestCase):
+    """Tests to check the documentation and style of serializers"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.json_f = inspect.getmembers(serializers.JSONSerializer,
+                                        inspect.isfunction)
+        cls.bin_f = inspect.getmembers(serializers.BinarySerializer,
+                                       inspect.isfunction)
+
+    def test_pep8_conformance_serializers(self):
+        """Test that models/engine/serializers.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/serializers.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_serializers(self):
+        """Test tests/test_models/test_serializers.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_serializers.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_serializers_module_docstring(self):
+        """Test for the serializers.py module docstring"""
+        self.assertIsNot(serializers.__doc__, None,
+                         "serializers.py needs a docstring")
+        self.assertTrue(len(serializers.__doc__) >= 1,
+                        "serializers.py needs a docstring")
+
+    def test_serializers_class_docstrings(self):
+        """Test for the serializer classes docstrings"""
+        for cls in [serializers.JSONSerializer, serializers.BinarySerializer]:
+            self.assertIsNot(cls.__doc__, None,
+                             "{} needs a docstring".format(cls.__name__))
+            self.assertTrue(len(cls.__doc__) >= 1,
+                            "{} needs a docstring".format(cls.__name__))
+
+    def test_serializers_func_docstrings(self):
+        """Test for the presence of docstrings in serializer methods"""
+        for func in self.json_f + self.bin_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestSerializers(unittest.TestCase):
+    """Test the snapshot serializers"""
+    def test_binary_round_trip(self):
+        """Test that the binary format keeps values and native datetimes"""
+        binary = serializers.serializers["binary"]
+        place = Place(name="Home", max_guest=3, latitude=1.5,
+                      amenity_ids=["a", "b"], description=None)
+        state = State(name="Été")
+        records = [("Place." + place.id, binary.record(place)),
+                   ("State." + state.id, binary.record(state))]
+        f = io.BytesIO()
+        binary.dump(f, records)
+        f.seek(0)
+        loaded = list(binary.load(f))
+        self.assertEqual(loaded, records)
+        self.assertIs(type(loaded[0][1]["created_at"]), datetime)
+        self.assertEqual(Place(**loaded[0][1]).created_at, place.created_at)
+
+    def test_binary_bad_header(self):
+        """Test that loading a file of another format raises ValueError"""
+        binary = serializers.serializers["binary"]
+        with self.assertRaises(ValueError):
+            list(binary.load(io.BytesIO(b'{"State.1": {}}')))
+
+    def test_convert(self):
+        """Test that convert goes from JSON to binary and back"""
+        state = State(name="California")
+        data = {"State." + state.id: state.to_dict()}
+        with open("test_convert.json", "w") as f:
+            json.dump(data, f)
+        try:
+            serializers.convert("test_convert.json", "test_convert.bin")
+            serializers.convert("test_convert.bin", "test_convert.json",
+                                "binary", "json")
+            with open("test_convert.json", "r") as f:
+                self.assertEqual(json.load(f), data)
+        finally:
+            for name in ["test_convert.json", "test_convert.bin"]:
+                if os.path.isfile(name):
+                    os.remove(name)
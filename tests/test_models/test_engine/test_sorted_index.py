@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+"""
+Contains the TestSortedIndexDocs and TestSortedIndex classes
+"""
+
+import inspect
+from models.engine import sorted_index
+import pep8
+import unittest
+SortedIndex = sorted_index.SortedIndex
+
+
+class TestSortedIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SortedIndex class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.si_f = inspect.getmembers(SortedIndex, inspect.isfunction)
+
+    def test_pep8_conformance_sorted_index(self):
+        """Test that models/engine/sorted_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/sorted_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_sorted_index(self):
+        """Test tests/test_models/test_sorted_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_sorted_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_sorted_index_module_docstring(self):
+        """Test for the sorted_index.py module docstring"""
+        self.assertIsNot(sorted_index.__doc__, None,
+                         "sorted_index.py needs a docstring")
+        self.assertTrue(len(sorted_index.__doc__) >= 1,
+                        "sorted_index.py needs a docstring")
+
+    def test_sorted_index_class_docstring(self):
+        """Test for the SortedIndex class docstring"""
+        self.assertIsNot(SortedIndex.__doc__, None,
+                         "SortedIndex class needs a docstring")
+        self.assertTrue(len(SortedIndex.__doc__) >= 1,
+                        "SortedIndex class needs a docstring")
+
+    def test_si_func_docstrings(self):
+        """Test for the presence of docstrings in SortedIndex methods"""
+        for func in self.si_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestSortedIndex(unittest.TestCase):
+    """Test the SortedIndex class"""
+    def test_order(self):
+        """Test that keys come ordered by value, then key, None first"""
+        index = SortedIndex()
+        for key, value in [("k1", "b"), ("k2", "a"), ("k3", None),
+                           ("k0", "b")]:
+            index.add(key, value)
+        self.assertEqual(list(index), ["k3", "k2", "k0", "k1"])
+        self.assertEqual(list(index.keys(reverse=True)),
+                         ["k1", "k0", "k2", "k3"])
+        self.assertEqual(len(index), 4)
+        self.assertIn("k3", index)
+        index.add("k4", "B")
+        index.add("k5", "Zed")
+        self.assertEqual(list(index), ["k3", "k2", "k4", "k0", "k1", "k5"])
+        self.assertEqual(list(index.range("B", "B")), ["k4"])
+        self.assertEqual(list(index.range("b", "c")), ["k0", "k1"])
+
+    def test_add_discard(self):
+        """Test that changing or removing a key updates the order"""
+        index = SortedIndex()
+        index.add("k1", "a")
+        index.add("k2", "b")
+        self.assertEqual(list(index), ["k1", "k2"])
+        index.add("k1", "c")
+        self.assertEqual(list(index), ["k2", "k1"])
+        index.discard("k2")
+        index.discard("missing")
+        self.assertEqual(list(index), ["k1"])
+        self.assertNotIn("k2", index)
+        self.assertEqual(len(index), 1)
+
+    def test_range(self):
+        """Test that range yields the keys of the values in the bounds"""
+        index = SortedIndex()
+        for key, value in [("k1", 3), ("k2", 1), ("k3", None), ("k4", 3),
+                           ("k5", 7)]:
+            index.add(key, value)
+        self.assertEqual(list(index.range(1, 3)), ["k2", "k1", "k4"])
+        self.assertEqual(list(index.range(2)), ["k1", "k4", "k5"])
+        self.assertEqual(list(index.range(high=3, reverse=True)),
+                         ["k4", "k1", "k2"])
+        self.assertEqual(list(index.range(4, 6)), [])
+        self.assertEqual(index.count(1, 3), 3)
+        self.assertEqual(index.count(), 4)
+        self.assertEqual(index.count(4, 6), 0)
+        self.assertEqual(index.count(5, 2), 0)
+
+    def test_few_added(self):
+        """Test that keys added to a large index are inserted in order"""
+        index = SortedIndex()
+        for i in range(100):
+            index.add("k{:03d}".format(i), i * 2)
+        list(index)
+        index.add("k050", 7)
+        index.add("new", 51)
+        self.assertEqual(list(index.range(6, 8)), ["k003", "k050", "k004"])
+        self.assertEqual(list(index.range(50, 52)), ["k025", "new", "k026"])
+        self.assertEqual(len(list(index)), 101)
+
+    def test_mixed_types(self):
+        """Test that values of different types are ordered, numbers
+        before strings, and that a failed merge adds nothing"""
+        index = SortedIndex()
+        for key, value in [("k1", "b"), ("k2", 5), ("k3", "a"), ("k4", 2.5),
+                           ("k5", None)]:
+            index.add(key, value)
+        self.assertEqual(list(index), ["k5", "k4", "k2", "k3", "k1"])
+        self.assertEqual(list(index.range(1, 10)), ["k4", "k2"])
+        self.assertEqual(list(index.range("a", "b")), ["k3", "k1"])
+        index.discard("k2")
+        self.assertEqual(list(index), ["k5", "k4", "k3", "k1"])
+        index = SortedIndex()
+        index.add("k1", [1])
+        self.assertEqual(list(index), ["k1"])
+        index.add("k2", ["a"])
+        with self.assertRaises(TypeError):
+            list(index)
+        self.assertEqual(len(index._SortedIndex__entries), 1)
@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+"""
+Contains the TestSQLiteStorageDocs and TestSQLiteStorage classes
+"""
+
+import inspect
+import models
+from models.engine import sqlite_storage
+import os
+import pep8
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+SQLiteStorage = sqlite_storage.SQLiteStorage
+
+
+class TestSQLiteStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SQLiteStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.sqs_f = inspect.getmembers(SQLiteStorage, inspect.isfunction)
+
+    def test_pep8_conformance_sqlite_storage(self):
+        """Test that models/engine/sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_sqlite_storage(self):
+        """Test tests/test_models/test_sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_sqlite_storage_module_docstring(self):
+        """Test for the sqlite_storage.py module docstring"""
+        self.assertIsNot(sqlite_storage.__doc__, None,
+                         "sqlite_storage.py needs a docstring")
+        self.assertTrue(len(sqlite_storage.__doc__) >= 1,
+                        "sqlite_storage.py needs a docstring")
+
+    def test_sqlite_storage_class_docstring(self):
+        """Test for the SQLiteStorage class docstring"""
+        self.assertIsNot(SQLiteStorage.__doc__, None,
+                         "SQLiteStorage class needs a docstring")
+        self.assertTrue(len(SQLiteStorage.__doc__) >= 1,
+                        "SQLiteStorage class needs a docstring")
+
+    def test_sqs_func_docstrings(self):
+        """Test for the presence of docstrings in SQLiteStorage methods"""
+        for func in self.sqs_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    """Test the SQLiteStorage class"""
+    def test_engine_selection(self):
+        """Test that HBNB_TYPE_STORAGE=sqlite selects SQLiteStorage on the
+        file HBNB_SQLITE_PATH"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "hbnb.db")
+            env = dict(os.environ, HBNB_TYPE_STORAGE="sqlite",
+                       HBNB_SQLITE_PATH=path)
+            env.pop("HBNB_ENV", None)
+            out = subprocess.run(
+                [sys.executable, "-c", "import models; "
+                 "print(type(models.storage).__name__, models.storage_t)"],
+                env=env, stdout=subprocess.PIPE, check=True,
+                universal_newlines=True).stdout
+            self.assertEqual(out.split(), ["SQLiteStorage", "db"])
+            self.assertTrue(os.path.isfile(path))
+
+    @unittest.skipIf(models.storage_engine != 'sqlite',
+                     "not testing sqlite storage")
+    def test_journal_mode(self):
+        """Test that the database file is in WAL mode"""
+        models.storage.reload()
+        conn = sqlite3.connect(os.getenv('HBNB_SQLITE_PATH', 'hbnb.db'))
+        try:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        finally:
+            conn.close()
+        self.assertEqual(mode, "wal")
+
+    @unittest.skipIf(models.storage_engine != 'sqlite',
+                     "not testing sqlite storage")
+    def test_indexes(self):
+        """Test that the foreign keys and the names are indexed"""
+        models.storage.reload()
+        conn = sqlite3.connect(os.getenv('HBNB_SQLITE_PATH', 'hbnb.db'))
+        try:
+            indexed = set()
+            for table in ("states", "cities", "amenities", "places",
+                          "reviews", "place_amenity"):
+                for index in conn.execute(
+                        "PRAGMA index_list({})".format(table)).fetchall():
+                    columns = conn.execute("PRAGMA index_info({})".format(
+                        index[1])).fetchall()
+                    indexed.update((table, column[2]) for column in columns)
+        finally:
+            conn.close()
+        for column in [("cities", "state_id"), ("places", "city_id"),
+                       ("places", "user_id"), ("reviews", "place_id"),
+                       ("reviews", "user_id"),
+                       ("place_amenity", "amenity_id"),
+                       ("states", "name"), ("cities", "name"),
+                       ("amenities", "name"), ("places", "name"),
+                       ("places", "latitude"), ("places", "longitude")]:
+            self.assertIn(column, indexed)
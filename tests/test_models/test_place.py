@@ -7,7 +7,9 @@ from datetime import datetime
 import inspect
 import models
 from models import place
+from models.amenity import Amenity
 from models.base_model import BaseModel
+from models.state import State
 import pep8
 import unittest
 Place = place.Place
@@ -165,11 +167,37 @@ class TestPlace(unittest.TestCase):
 
     @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
     def test_amenity_ids_attr(self):
-        """Test Place has attr amenity_ids, and it's an empty list"""
+        """Test Place has attr amenity_ids, and it's an empty set of its
+        own"""
         place = Place()
         self.assertTrue(hasattr(place, "amenity_ids"))
-        self.assertEqual(type(place.amenity_ids), list)
+        self.assertEqual(type(place.amenity_ids), set)
         self.assertEqual(len(place.amenity_ids), 0)
+        self.assertIsNot(place.amenity_ids, Place().amenity_ids)
+        place = Place(**Place(amenity_ids=["b", "a"]).to_dict())
+        self.assertEqual(place.amenity_ids, {"a", "b"})
+        self.assertEqual(place.to_dict()["amenity_ids"], ["a", "b"])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_amenities_file(self):
+        """Test that the amenities setter adds ids the getter looks up"""
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        models.storage.new(wifi)
+        models.storage.new(pool)
+        place = Place()
+        try:
+            place.amenities = wifi
+            place.amenities = pool
+            place.amenities = wifi
+            place.amenities = State()
+            self.assertEqual(place.amenity_ids, {wifi.id, pool.id})
+            self.assertEqual(place.amenities, [pool, wifi])
+            models.storage.delete(pool)
+            self.assertEqual(place.amenities, [wifi])
+        finally:
+            models.storage.delete(wifi)
+            models.storage.delete(pool)
 
     def test_to_dict_creates_dict(self):
         """test to_dict method creates a dictionary with proper attrs"""